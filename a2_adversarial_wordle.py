@@ -32,13 +32,29 @@ This file is Copyright (c) 2023 Mario Badr, David Liu, and Angela Zavaleta Bernu
 """
 from __future__ import annotations
 import copy
+import csv
+import itertools
 import random
-from typing import Iterable, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
 
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import a2_feedback
+import a2_game_records
+import a2_moves
+import a2_word_index
+import a2_word_sets
 
-from python_ta.contracts import check_contracts
+
+def check_contracts(obj: Any) -> Any:
+    """Return python_ta.contracts.check_contracts(obj).
+
+    python_ta is only imported when this decorator is used (rather than when this module is imported),
+    so that programs that do not check contracts (including worker processes) do not need to load it.
+    """
+    from python_ta.contracts import check_contracts as python_ta_check_contracts
+
+    return python_ta_check_contracts(obj)
 
 
 # === NOTE ABOUT USING check_contracts (PLEASE READ!) ===
@@ -51,6 +67,9 @@ from python_ta.contracts import check_contracts
 class AdversarialWordle:
     """A class representing the state of a game of Adversarial Wordle.
 
+    Each AdversarialWordle is a thin, mutable wrapper around an immutable GameState. Recording a move
+    replaces the wrapped state with a new one, and copying a game only copies a reference to its state.
+
     Instance Attributes:
     - word_set: a set of the allowed words for this game
     - max_guesses: the maximum number of guesses the Guesser player is allowed to make in this game
@@ -59,6 +78,8 @@ class AdversarialWordle:
     - statuses: a list of the statuses returned by the Adversary player
                 NOTE: unlike CSC110 Assignment 2, each status is represented as a tuple
                 instead of a list.
+                NOTE: guesses and statuses are rebuilt from the game state each time they are accessed,
+                so mutating these lists does not change the game.
 
     Representation Invariants:
     - len(self.word_set) > 0
@@ -70,35 +91,67 @@ class AdversarialWordle:
     - all(len(status) == self.word_size for status in self.statuses)
     - all(_is_valid_status(status) for status in self.statuses)
     """
-    word_set: frozenset[str]  # frozenset is like set, but immutable
-    word_size: int
-    max_guesses: int
-    guesses: list[str]
-    statuses: list[tuple[str, ...]]  # tuple[str, ...] means "a tuple of strings"
-    _possible_answers: frozenset[str]
+    # Private Instance Attributes:
+    #   - _state: the current state of this game
+    _state: GameState
 
-    def __init__(self, word_set: Iterable[str], max_guesses: int) -> None:
+    def __init__(self, word_set: Iterable[str], max_guesses: int,
+                 feedback: Optional[a2_feedback.FeedbackMatrix] = None) -> None:
         """Initialize a new Adversarial Wordle game with the given word_set and max_guesses.
 
+        If feedback is not None, statuses are looked up in that feedback matrix instead of being
+        computed character by character.
+
         Preconditions:
         - len(word_set) > 0
         - all words in word_set have the same length
         - max_guesses >= 1
+        - feedback is None or all(word in feedback for word in word_set)
+        - if isinstance(word_set, a2_word_sets.WordSet), then feedback is None or feedback is word_set.feedback
         """
-        if isinstance(word_set, frozenset):
-            self.word_set = word_set
-        else:
-            self.word_set = frozenset(word_set)
-        self.word_size = len(next(iter(word_set)))
-        self.max_guesses = max_guesses
-        self.guesses = []
-        self.statuses = []
-        self._possible_answers = self.word_set
+        self._state = GameState(word_set, max_guesses, feedback)
+
+    @classmethod
+    def from_state(cls, state: GameState) -> AdversarialWordle:
+        """Return a new game that wraps the given game state."""
+        game = cls.__new__(cls)
+        game._state = state
+        return game
+
+    @property
+    def state(self) -> GameState:
+        """The current (immutable) state of this game."""
+        return self._state
+
+    @property
+    def word_set(self) -> frozenset[str]:
+        """A set of the allowed words for this game."""
+        return self._state.config.word_set
+
+    @property
+    def word_size(self) -> int:
+        """The length of the words in this game."""
+        return self._state.config.word_size
+
+    @property
+    def max_guesses(self) -> int:
+        """The maximum number of guesses the Guesser player is allowed to make in this game."""
+        return self._state.config.max_guesses
+
+    @property
+    def guesses(self) -> list[str]:
+        """A list of the guesses made by the Guesser player."""
+        return self._state.get_guesses()
+
+    @property
+    def statuses(self) -> list[tuple[str, ...]]:
+        """A list of the statuses returned by the Adversary player."""
+        return self._state.get_statuses()
 
     def is_guesser_turn(self) -> bool:
         """Return whether it is the Guesser player's turn.
         """
-        return len(self.guesses) == len(self.statuses)
+        return self._state.guesser_turn
 
     def record_guesser_move(self, guess: str) -> None:
         """Record the given guess made by the Guesser player.
@@ -106,9 +159,9 @@ class AdversarialWordle:
         Preconditions:
         - self.is_guesser_turn()
         - len(guess) == self.word_size
-        - guess in self._possible_answers
+        - guess in self._state.possible_answers
         """
-        self.guesses.append(guess)
+        self._state = self._state.record_guess(guess)
 
     def record_adversary_move(self, status: tuple[str, ...]) -> None:
         """Record the given status returned by the Adversary player.
@@ -118,10 +171,7 @@ class AdversarialWordle:
         - len(status) == self.word_size
         - _is_valid_status(status)
         """
-        self.statuses.append(status)
-
-        # Update self._possible_answers
-        self._possible_answers = _find_correct_answers(self._possible_answers, self.guesses, self.statuses)
+        self._state = self._state.record_status(status)
 
     def copy_and_record_guesser_move(self, guess: str) -> AdversarialWordle:
         """Return a copy of this game state with the given guess recorded.
@@ -129,11 +179,9 @@ class AdversarialWordle:
         Preconditions:
         - self.is_guesser_turn()
         - len(guess) == self.word_size
-        - guess in self._possible_answers
+        - guess in self._state.possible_answers
         """
-        new_game = self._copy()
-        new_game.record_guesser_move(guess)
-        return new_game
+        return AdversarialWordle.from_state(self._state.record_guess(guess))
 
     def copy_and_record_adversary_move(self, status: tuple[str, ...]) -> AdversarialWordle:
         """Return a copy of this game state with the given status recorded.
@@ -142,19 +190,31 @@ class AdversarialWordle:
         - not self.is_guesser_turn()
         - len(status) == self.word_size
         - _is_valid_status(status)
+
+        The possible answers of this game state are partitioned by status the first time this method
+        is called for the most recent guess, so copying this game state with each different status
+        does not rescan the possible answers.
+        """
+        self._state.partition_by_status_code()
+        return AdversarialWordle.from_state(self._state.record_status(status))
+
+    def copy_and_record_adversary_move_code(self, status_code: int) -> AdversarialWordle:
+        """Return a copy of this game state with the status that has the given move code (see a2_moves)
+        recorded.
+
+        This is the same as copy_and_record_adversary_move, but does not need to encode the status.
+
+        Preconditions:
+        - not self.is_guesser_turn()
+        - a2_moves.is_status_code(status_code)
+        - len(a2_moves.decode_status(status_code)) == self.word_size
         """
-        new_game = self._copy()
-        new_game.record_adversary_move(status)
-        return new_game
+        self._state.partition_by_status_code()
+        return AdversarialWordle.from_state(self._state.record_status_code(status_code))
 
     def _copy(self) -> AdversarialWordle:
         """Return a copy of this game state."""
-        new_game = AdversarialWordle(self.word_set, self.max_guesses)
-        new_game.word_size = self.word_size
-        new_game.guesses.extend(self.guesses)
-        new_game.statuses.extend(self.statuses)
-        new_game._possible_answers = self._possible_answers
-        return new_game
+        return AdversarialWordle.from_state(self._state)
 
     def get_possible_answers(self) -> list[str]:
         """Return the possible answers for the current game state, or [] if a player has won the game.
@@ -162,40 +222,67 @@ class AdversarialWordle:
         The words returned are consistent with the guesses and statuses that
         have been recorded. If len(self.guesses) == len(self.statuses) + 1,
         the last guess is ignored, since it does not yet have a corresponding status.
+
+        The possible answers of every state of a random game agree with filtering the whole word set by
+        all the guesses and statuses so far, even after later moves are recorded:
+
+        >>> word_set = a2_word_sets.load_word_set('data/words/official_wordle_100.txt')
+        >>> random.seed(111)
+        >>> checked = []
+        >>> for _ in range(0, 50):
+        ...     game = AdversarialWordle(word_set, 4, word_set.feedback)
+        ...     while game.get_winner() is None:
+        ...         if game.is_guesser_turn():
+        ...             game.record_guesser_move(random.choice(sorted(game.get_possible_answers())))
+        ...         else:
+        ...             answer = random.choice(sorted(game.state.possible_answers))
+        ...             game.record_adversary_move(game.get_status_for_answer(answer))
+        ...             expected = _find_correct_answers(word_set, game.guesses, game.statuses)
+        ...             checked.append((game.state, expected))
+        >>> all(set(state.possible_answers) == expected for state, expected in checked)
+        True
+        >>> all(state.guesses_remaining == 4 - len(state.get_guesses()) for state, _ in checked)
+        True
         """
-        if self.get_winner() is None:
-            return list(self._possible_answers)
+        if self._state.winner is None:
+            return list(self._state.possible_answers)
         else:
             return []
 
+    def get_answers_by_status(self) -> dict[tuple[str, ...], a2_word_index.CandidateSet]:
+        """Return a mapping from each status the Adversary can return for the most recent guess to
+        the possible answers that would remain after that status.
+
+        The possible answers are split into these buckets in a single pass, which is cached until
+        the next move is recorded.
+
+        Preconditions:
+        - not self.is_guesser_turn()
+
+        >>> game = AdversarialWordle({'hello', 'words', 'world'}, 3)
+        >>> game.record_guesser_move('words')
+        >>> buckets = game.get_answers_by_status()
+        >>> sorted(buckets[('Y', 'Y', 'Y', '?', 'N')])
+        ['world']
+        >>> len(buckets)
+        3
+        """
+        return self._state.partition_possible_answers()
+
     def get_status_for_answer(self, answer: str) -> tuple[str, ...]:
         """Return the status for the most recent guess with respect to the given answer.
 
         Preconditions:
         - not self.is_guesser_turn()
         """
-        return _get_guess_status(answer, self.guesses[-1])
+        return self._state.get_status_for_answer(answer)
 
     def get_winner(self) -> Optional[str]:
         """Return the winner of the game ('Guesser' or 'Adversary').
 
         Return None if the game is not over.
         """
-        if len(self.guesses) != len(self.statuses):
-            # It is the Adversary's turn; no one has won yet
-            return None
-        elif len(self.statuses) == 0:
-            # No moves have been made; no one has won yet
-            return None
-        elif all(s == CORRECT for s in self.statuses[-1]):
-            # The Adversary returned an "all correct" guess; Guesser has won
-            return 'Guesser'
-        elif len(self.statuses) == self.max_guesses:
-            # The Guesser has no more guesses; Adversary has won
-            return 'Adversary'
-        else:
-            # It is the Guesser's turn; no one has won yet
-            return None
+        return self._state.winner
 
     def get_move_sequence(self) -> list[str | tuple[str, ...]]:
         """Return the move sequence made in this game.
@@ -204,13 +291,266 @@ class AdversarialWordle:
 
             [self.guesses[0], self.statuses[0], self.guesses[1], self.statuses[1], ...]
         """
-        moves_so_far = []
-        for i in range(0, len(self.guesses)):
-            moves_so_far.append(self.guesses[i])
-            if i < len(self.statuses):  # self.statuses may be 1 shorter than self.guesses
-                moves_so_far.append(self.statuses[i])
+        return self._state.get_move_sequence()
+
+
+################################################################################
+# Persistent game states
+################################################################################
+class GameConfig:
+    """The settings of a game of Adversarial Wordle, which are shared by all of its game states.
+
+    Instance Attributes:
+    - word_set: a set of the allowed words for the game
+    - word_size: the length of the words in the game
+    - max_guesses: the maximum number of guesses the Guesser player is allowed to make in the game
+    - feedback: the feedback matrix used to look up statuses, or None if statuses are computed directly
+    - index: the word index that candidate answers are drawn from
+    - all_correct_code: the move code of the "all correct" status (see a2_moves)
+    """
+    __slots__ = ('word_set', 'word_size', 'max_guesses', 'feedback', 'index', 'all_correct_code')
+    word_set: frozenset[str]
+    word_size: int
+    max_guesses: int
+    feedback: Optional[a2_feedback.FeedbackMatrix]
+    index: a2_word_index.WordIndex
+    all_correct_code: int
+
+    def __init__(self, word_set: frozenset[str], max_guesses: int,
+                 feedback: Optional[a2_feedback.FeedbackMatrix]) -> None:
+        """Initialize the settings for a game with the given word_set, max_guesses, and feedback matrix.
+
+        See AdversarialWordle.__init__ for the preconditions.
+        """
+        self.word_set = word_set
+        self.word_size = len(next(iter(word_set)))
+        self.max_guesses = max_guesses
+        self.feedback = feedback
+        if isinstance(word_set, a2_word_sets.WordSet):
+            self.index = word_set.index
+        else:
+            # When there is a feedback matrix, index its words so that word ids agree between the two
+            self.index = a2_word_index.get_word_index(feedback.words if feedback is not None else word_set)
+        self.all_correct_code = a2_moves.all_correct_status_code(self.word_size)
+
+
+class GameState:
+    """An immutable state of a game of Adversarial Wordle.
 
-        return moves_so_far
+    A game state stores only its most recent move and the state it was reached from, so the move
+    history is a chain of parent links shared by every state that extends it. Recording a move
+    creates one new GameState without copying the history, and the winner, the current turn and
+    the number of remaining guesses are stored when the state is created.
+
+    Instance Attributes:
+    - config: the settings of the game
+    - parent: the state before the most recent move, or None if no moves have been made
+    - move: the most recent move, or None if no moves have been made
+    - move_code: the move code of the most recent move (see a2_moves), or a2_moves.GAME_START_CODE if no
+                 moves have been made
+    - num_moves: the number of moves that have been made
+    - guesser_turn: whether it is the Guesser player's turn
+    - guesses_remaining: the number of guesses the Guesser player may still make
+    - winner: the winner of the game ('Guesser' or 'Adversary'), or None if the game is not over
+    - possible_answers: the words consistent with every status that has been recorded
+
+    Representation Invariants:
+    - (self.parent is None) == (self.move is None) == (self.num_moves == 0)
+    - self.guesser_turn == (self.num_moves % 2 == 0)
+    - 0 <= self.guesses_remaining <= self.config.max_guesses
+    """
+    __slots__ = ('config', 'parent', 'move', 'move_code', 'num_moves', 'guesser_turn', 'guesses_remaining',
+                 'winner', 'possible_answers', '_answers_by_status')
+    config: GameConfig
+    parent: Optional[GameState]
+    move: Optional[str | tuple[str, ...]]
+    move_code: int
+    num_moves: int
+    guesser_turn: bool
+    guesses_remaining: int
+    winner: Optional[str]
+    possible_answers: a2_word_index.CandidateSet
+
+    # Private Instance Attributes:
+    #   - _answers_by_status: a cache of partition_by_status_code, or None if it has not been computed
+    _answers_by_status: Optional[dict[int, a2_word_index.CandidateSet]]
+
+    def __init__(self, word_set: Iterable[str], max_guesses: int,
+                 feedback: Optional[a2_feedback.FeedbackMatrix] = None) -> None:
+        """Initialize the starting state of a game with the given word_set, max_guesses, and feedback matrix.
+
+        See AdversarialWordle.__init__ for the preconditions.
+        """
+        if not isinstance(word_set, frozenset):
+            word_set = frozenset(word_set)
+        self.config = GameConfig(word_set, max_guesses, feedback)
+        self.parent = None
+        self.move = None
+        self.move_code = a2_moves.GAME_START_CODE
+        self.num_moves = 0
+        self.guesser_turn = True
+        self.guesses_remaining = max_guesses
+        self.winner = None
+        self.possible_answers = self.config.index.candidates(word_set)
+        self._answers_by_status = None
+
+    def __getstate__(self) -> dict:
+        """Return the state of this game state for pickling.
+
+        Move codes are only meaningful in the process that created them (see a2_moves), so the move code
+        is not pickled, and is encoded again from the move when the state is unpickled.
+
+        >>> import pickle
+        >>> state = GameState({'hello', 'words', 'world'}, 3).record_guess('world')
+        >>> data = pickle.dumps(state)
+        >>> a2_moves.reset_guess_ids()  # Like a new process, which assigns guess ids in a different order
+        >>> a2_moves.encode_guess('hello')
+        0
+        >>> copied_state = pickle.loads(data)
+        >>> a2_moves.decode_move(copied_state.move_code)
+        'world'
+        """
+        state = {name: getattr(self, name) for name in GameState.__slots__}
+        del state['move_code']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state of this game state from pickling."""
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.move_code = a2_moves.GAME_START_CODE if self.move is None else a2_moves.encode_move(self.move)
+
+    def _extend(self, move: str | tuple[str, ...], move_code: int,
+                possible_answers: a2_word_index.CandidateSet) -> GameState:
+        """Return a new state whose parent is this state and whose most recent move is move,
+        with the given move code.
+
+        The new state's winner and guesses_remaining are set by the caller.
+        """
+        state = GameState.__new__(GameState)
+        state.config = self.config
+        state.parent = self
+        state.move = move
+        state.move_code = move_code
+        state.num_moves = self.num_moves + 1
+        state.guesser_turn = not self.guesser_turn
+        state.guesses_remaining = self.guesses_remaining
+        state.winner = None
+        state.possible_answers = possible_answers
+        state._answers_by_status = None
+        return state
+
+    def record_guess(self, guess: str) -> GameState:
+        """Return the state after the Guesser player makes the given guess.
+
+        Preconditions:
+        - self.guesser_turn and self.winner is None
+        - guess in self.config.word_set
+        """
+        state = self._extend(guess, a2_moves.encode_guess(guess), self.possible_answers)
+        state.guesses_remaining = self.guesses_remaining - 1
+        return state
+
+    def record_status(self, status: tuple[str, ...]) -> GameState:
+        """Return the state after the Adversary player returns the given status.
+
+        Every possible answer of this state is already consistent with the earlier rounds, so only the
+        most recent guess and the given status are checked.
+
+        Preconditions:
+        - not self.guesser_turn
+        - len(status) == self.config.word_size
+        - _is_valid_status(status)
+        """
+        return self.record_status_code(a2_moves.encode_status(status))
+
+    def record_status_code(self, status_code: int) -> GameState:
+        """Return the state after the Adversary player returns the status with the given move code.
+
+        Preconditions:
+        - not self.guesser_turn
+        - a2_moves.is_status_code(status_code)
+        - len(a2_moves.decode_status(status_code)) == self.config.word_size
+        """
+        config = self.config
+        if self._answers_by_status is not None:
+            possible_answers = self._answers_by_status.get(status_code)
+            if possible_answers is None:
+                possible_answers = a2_word_index.CandidateSet(config.index, 0)
+        else:
+            pattern = a2_moves.status_pattern(status_code, config.word_size)
+            possible_answers = self.possible_answers.filter(self.move, _pattern_digits(pattern, config.word_size))
+
+        state = self._extend(a2_moves.decode_status(status_code), status_code, possible_answers)
+        if status_code == config.all_correct_code:
+            # The Adversary returned an "all correct" guess; Guesser has won
+            state.winner = 'Guesser'
+        elif self.guesses_remaining == 0:
+            # The Guesser has no more guesses; Adversary has won
+            state.winner = 'Adversary'
+        return state
+
+    def partition_by_status_code(self) -> dict[int, a2_word_index.CandidateSet]:
+        """Return (and cache) the possible answers of this state partitioned by the move code of their
+        status for the most recent guess.
+
+        Do not mutate the returned dictionary.
+
+        Preconditions:
+        - not self.guesser_turn
+        """
+        if self._answers_by_status is None:
+            self._answers_by_status = _partition_answers(self.possible_answers, self.move, self.config.feedback)
+        return self._answers_by_status
+
+    def partition_possible_answers(self) -> dict[tuple[str, ...], a2_word_index.CandidateSet]:
+        """Return the possible answers of this state partitioned by their status for the most recent guess.
+
+        Preconditions:
+        - not self.guesser_turn
+        """
+        return {a2_moves.decode_status(code): answers for code, answers in self.partition_by_status_code().items()}
+
+    def get_status_for_answer(self, answer: str) -> tuple[str, ...]:
+        """Return the status for the most recent guess with respect to the given answer.
+
+        Preconditions:
+        - not self.guesser_turn
+        """
+        feedback = self.config.feedback
+        if feedback is not None:
+            return _decode_status(feedback.pattern(self.move, answer), self.config.word_size)
+        return _get_guess_status(answer, self.move)
+
+    def signature(self) -> tuple:
+        """Return a canonical signature of this state.
+
+        Two states of the same game with equal signatures have the same possible answers, the same
+        number of remaining guesses, the same winner, the same player to move, and (on the Adversary's
+        turn) the same pending guess, so every sequence of moves that can follow one of them can also
+        follow the other, with the same result.
+
+        The pending guess is stored as its move code, so signatures must not be compared between processes.
+        """
+        pending_guess = None if self.guesser_turn else self.move_code
+        return (self.possible_answers.mask, self.guesses_remaining, self.guesser_turn, pending_guess, self.winner)
+
+    def get_move_sequence(self) -> list[str | tuple[str, ...]]:
+        """Return the moves made to reach this state, in the order they were made."""
+        moves = [None] * self.num_moves
+        state = self
+        while state.parent is not None:
+            moves[state.num_moves - 1] = state.move
+            state = state.parent
+        return moves
+
+    def get_guesses(self) -> list[str]:
+        """Return the guesses made to reach this state, in the order they were made."""
+        return self.get_move_sequence()[0::2]
+
+    def get_statuses(self) -> list[tuple[str, ...]]:
+        """Return the statuses returned to reach this state, in the order they were returned."""
+        return self.get_move_sequence()[1::2]
 
 
 ################################################################################
@@ -312,10 +652,8 @@ def run_game(guesser: Guesser, adversary: Adversary, word_set_file: str, max_gue
     - all words in word_set_file have the same length
     - max_guesses >= 1
     """
-    with open(word_set_file) as f:
-        word_set = {str.strip(line.lower()) for line in f}
-
-    game = AdversarialWordle(word_set, max_guesses)
+    word_set = a2_word_sets.load_word_set(word_set_file)
+    game = AdversarialWordle(word_set, max_guesses, word_set.feedback)
 
     while game.get_winner() is None:
         guess = guesser.make_move(game)
@@ -329,37 +667,50 @@ def run_game(guesser: Guesser, adversary: Adversary, word_set_file: str, max_gue
 def run_games(num_games: int,
               guesser: Guesser, adversary: Adversary,
               word_set_file: str, max_guesses: int,
-              print_game: bool = True,
-              show_stats: bool = False) -> dict[str, int]:
+              print_game: bool | int = True,
+              show_stats: bool = False,
+              seed: Optional[int] = None,
+              workers: int = 1,
+              sinks: Iterable[a2_game_records.GameRecordSink] = (),
+              quiet: bool = False) -> dict[str, int]:
     """Run num_games games of Adversary Wordle between the two given players.
 
     Use the given word_set_file and max_guesses (these parameters are the same as
     in run_game).
 
     Optional arguments:
-    - print_game: print a record of each game (default: True)
+    - print_game: print a record of each game if True, or of every print_game-th game (with the
+      number of games won by each player so far) if it is an int greater than 1 (default: True)
     - show_stats: use Plotly to display statistics for the game runs (default: False)
+    - seed, workers: see play_games (default: no seed, and play every game in this process)
+    - sinks: game record sinks (see a2_game_records) that the record of each game is added to, in
+      order, as soon as it is played. The sinks are not closed by this function (default: none)
+    - quiet: do not print anything, including the number of games won by each player (default: False)
+
+    The word set file is read only once (see a2_word_sets.load_word_set), and every game shares it.
 
     Preconditions:
         - num_games >= 1
         - same preconditions for word_set_file and max_guesses as run_game
+        - workers >= 1
     """
+    sinks = list(sinks)
+    if print_game and not quiet:
+        sinks.append(a2_game_records.ProgressReporter(int(print_game)))
+
     stats = {'Guesser': 0, 'Adversary': 0}
     results = []
-    for i in range(0, num_games):
-        guesser_copy = copy.copy(guesser)
-        adversary_copy = copy.copy(adversary)
-
-        game = run_game(guesser_copy, adversary_copy, word_set_file, max_guesses)
-        winner = game.get_winner()
-        stats[winner] += 1
-        results.append(winner)
-
-        if print_game:
-            print(f'Game {i} winner: {winner}. Moves: {game.get_move_sequence()}')
-
-    for outcome in stats:
-        print(f'{outcome}: {stats[outcome]}/{num_games} ({100.0 * stats[outcome] / num_games:.2f}%)')
+    records = iter_game_records(num_games, guesser, adversary, word_set_file, max_guesses,
+                                seed, workers, record_moves=sinks != [])
+    for record in records:
+        stats[record.winner] += 1
+        results.append(record.winner)
+        for sink in sinks:
+            sink.add(record)
+
+    if not quiet:
+        for outcome in stats:
+            print(f'{outcome}: {stats[outcome]}/{num_games} ({100.0 * stats[outcome] / num_games:.2f}%)')
 
     if show_stats:
         plot_game_statistics(results)
@@ -367,34 +718,268 @@ def run_games(num_games: int,
     return stats
 
 
-def plot_game_statistics(results: list[str]) -> None:
+def play_games(num_games: int,
+               guesser: Guesser, adversary: Adversary,
+               word_set_file: str, max_guesses: int,
+               seed: Optional[int] = None,
+               workers: int = 1) -> tuple[dict[str, int], list[str]]:
+    """Play num_games games of Adversarial Wordle between the two given players, without printing
+    anything, and return the number of games each player won and the winner of each game (in order).
+
+    Each game is played by copies of guesser and adversary (made with copy.copy), like in run_games.
+
+    If workers > 1, the games are played by a pool of that many processes. The players (including any
+    game tree they use) are sent to each process once, so they must be picklable.
+
+    If seed is not None, the games are split into blocks of consecutive games, and the random module
+    is seeded with a seed derived from seed and the block's number before each block is played. This
+    makes the results depend only on seed (and not on workers, or on how the processes are scheduled),
+    as long as the players only use the random module for their random choices. If seed is None and
+    workers > 1, a seed is chosen randomly.
+
+    >>> word_set_file = 'data/words/official_wordle_100.txt'
+    >>> serial = play_games(600, RandomGuesser(), RandomAdversary(), word_set_file, 3, seed=111)
+    >>> serial == play_games(600, RandomGuesser(), RandomAdversary(), word_set_file, 3, seed=111, workers=3)
+    True
+    >>> serial[0]['Guesser'] == serial[1].count('Guesser')
+    True
+
+    Preconditions:
+        - num_games >= 1
+        - same preconditions for word_set_file and max_guesses as run_game
+        - workers >= 1
+    """
+    stats = {'Guesser': 0, 'Adversary': 0}
+    results = []
+    for record in iter_game_records(num_games, guesser, adversary, word_set_file, max_guesses,
+                                    seed, workers, record_moves=False):
+        stats[record.winner] += 1
+        results.append(record.winner)
+
+    return stats, results
+
+
+def iter_game_records(num_games: int,
+                      guesser: Guesser, adversary: Adversary,
+                      word_set_file: str, max_guesses: int,
+                      seed: Optional[int] = None, workers: int = 1,
+                      record_moves: bool = True) -> Iterator[a2_game_records.GameRecord]:
+    """Return an iterator that plays num_games games as described in play_games, and returns the record
+    of each game (see a2_game_records) in order. Games are only played as the records are consumed
+    (when workers > 1, a block of games at a time in each process).
+
+    If record_moves is False, the records do not include the games' move sequences.
+
+    >>> records = iter_game_records(10, RandomGuesser(), RandomAdversary(),
+    ...                             'data/words/official_wordle_100.txt', 3, seed=111)
+    >>> record = next(records)
+    >>> len(record.moves) == 2 * record.num_rounds
+    True
+
+    Preconditions:
+        - num_games >= 1
+        - same preconditions for word_set_file and max_guesses as run_game
+        - workers >= 1
+    """
+    a2_word_sets.load_word_set(word_set_file)
+    if seed is None and workers == 1:
+        yield from _iter_block(guesser, adversary, word_set_file, max_guesses,
+                               None, num_games, record_moves)
+        return
+
+    if seed is None:
+        seed = random.getrandbits(64)
+    tasks = [(f'{seed}:{block}', min(_GAMES_PER_BLOCK, num_games - start), record_moves)
+             for block, start in enumerate(range(0, num_games, _GAMES_PER_BLOCK))]
+
+    if workers == 1:
+        for block_seed, block_games, _ in tasks:
+            yield from _iter_block(guesser, adversary, word_set_file, max_guesses,
+                                   block_seed, block_games, record_moves)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(guesser, adversary, word_set_file, max_guesses)) as executor:
+            for records in executor.map(_play_block, tasks):
+                yield from records
+
+
+# The number of consecutive games in each block of games played with the same seed (see play_games).
+# The blocks do not depend on the number of workers, so neither do the results for a given seed.
+_GAMES_PER_BLOCK = 200
+
+# The players, word set file and maximum number of guesses of this worker process (see _init_worker)
+_worker_settings: Optional[tuple[Guesser, Adversary, str, int]] = None
+
+
+def _iter_block(guesser: Guesser, adversary: Adversary,
+                word_set_file: str, max_guesses: int,
+                block_seed: Optional[str], num_games: int,
+                record_moves: bool) -> Iterator[a2_game_records.GameRecord]:
+    """Play num_games games between copies of the given players, after seeding the random module with
+    block_seed (unless it is None). Return an iterator over the records of the games.
+    """
+    if block_seed is not None:
+        random.seed(block_seed)
+
+    for _ in range(0, num_games):
+        start = time.perf_counter()
+        game = run_game(copy.copy(guesser), copy.copy(adversary), word_set_file, max_guesses)
+        duration = time.perf_counter() - start
+
+        moves = a2_game_records.encode_move_sequence(game.get_move_sequence()) if record_moves else None
+        yield a2_game_records.GameRecord(game.get_winner(), len(game.guesses), moves, duration)
+
+
+def _init_worker(guesser: Guesser, adversary: Adversary, word_set_file: str, max_guesses: int) -> None:
+    """Store the players and game settings of this worker process, and load its word set."""
+    global _worker_settings
+    _worker_settings = (guesser, adversary, word_set_file, max_guesses)
+    a2_word_sets.load_word_set(word_set_file)
+
+
+def _play_block(task: tuple[str, int, bool]) -> list[a2_game_records.GameRecord]:
+    """Play a block of games in a worker process (see iter_game_records and _iter_block)."""
+    block_seed, num_games, record_moves = task
+    return list(_iter_block(*_worker_settings, block_seed, num_games, record_moves))
+
+
+# The default number of games in the rolling window of game_statistics and plot_game_statistics
+DEFAULT_WINDOW = 50
+
+# The default maximum number of points that plot_game_statistics draws for each trace
+DEFAULT_MAX_POINTS = 5000
+
+
+def plot_game_statistics(results: list[str], window: int = DEFAULT_WINDOW,
+                         max_points: Optional[int] = DEFAULT_MAX_POINTS) -> None:
     """Plot the outcomes and win probabilities for a given list of Adversarial Wordle game results.
 
+    The rolling win percentage is taken over the most recent window games. If a trace has more than
+    max_points points, it is decimated to at most max_points points by keeping the smallest and largest
+    value in each of max_points // 2 consecutive ranges of games (see _decimate), so that the plot keeps
+    the shape of the data without sending every point to Plotly. If max_points is None, every point is
+    plotted.
+
+    Use game_statistics or save_game_statistics to get the plotted values without plotting them.
+
     Preconditions:
         - all(r in {'Guesser', 'Adversary'} for r in results)
+        - window >= 1
+        - max_points is None or max_points >= 2
     """
-    outcomes = [1 if result == 'Guesser' else 0 for result in results]
+    # Plotly is only imported when it is needed, since it takes a long time to import
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
 
-    cumulative_win_percentage = [sum(outcomes[0:i]) / i for i in range(1, len(outcomes) + 1)]
-    rolling_win_percentage = \
-        [sum(outcomes[max(i - 50, 0):i]) / min(50, i) for i in range(1, len(outcomes) + 1)]
+    statistics = game_statistics(results, window)
+
+    traces = [('outcomes', 'markers', 'Outcome (1 = Guesser win, 0 = Adversary win)', 1),
+              ('cumulative_win_percentage', 'lines', 'Guesser win percentage (cumulative)', 2),
+              ('rolling_win_percentage', 'lines', f'Guesser win percentage (most recent {window} games)', 2)]
 
     fig = make_subplots(rows=2, cols=1)
-    fig.add_trace(go.Scatter(y=outcomes, mode='markers',
-                             name='Outcome (1 = Guesser win, 0 = Adversary win)'),
-                  row=1, col=1)
-    fig.add_trace(go.Scatter(y=cumulative_win_percentage, mode='lines',
-                             name='Guesser win percentage (cumulative)'),
-                  row=2, col=1)
-    fig.add_trace(go.Scatter(y=rolling_win_percentage, mode='lines',
-                             name='Guesser win percentage (most recent 50 games)'),
-                  row=2, col=1)
+    for key, mode, name, row in traces:
+        x, y = _decimate(statistics[key], max_points)
+        fig.add_trace(go.Scatter(x=x, y=y, mode=mode, name=name), row=row, col=1)
     fig.update_yaxes(range=[0.0, 1.0], row=2, col=1)
 
     fig.update_layout(title='Adversary Wordle Game Results', xaxis_title='Game')
     fig.show()
 
 
+def game_statistics(results: list[str], window: int = DEFAULT_WINDOW) -> dict[str, list[float]]:
+    """Return the series plotted by plot_game_statistics for the given list of game results:
+
+        - 'outcomes': 1 for each game the Guesser won, and 0 for each game the Adversary won,
+        - 'cumulative_win_percentage': the fraction of the games up to and including each game that
+          the Guesser won, and
+        - 'rolling_win_percentage': the fraction of the most recent window games up to and including
+          each game that the Guesser won.
+
+    The series are calculated in linear time from a running total of the outcomes (with NumPy, if it
+    is installed).
+
+    >>> statistics = game_statistics(['Guesser', 'Adversary', 'Guesser', 'Guesser'], window=2)
+    >>> statistics['cumulative_win_percentage']
+    [1.0, 0.5, 0.6666666666666666, 0.75]
+    >>> statistics['rolling_win_percentage']
+    [1.0, 0.5, 0.5, 1.0]
+
+    Preconditions:
+        - all(r in {'Guesser', 'Adversary'} for r in results)
+        - window >= 1
+    """
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    n = len(results)
+    if numpy is None:
+        outcomes = [1 if result == 'Guesser' else 0 for result in results]
+        # totals[i] is the number of games the Guesser won among the first i games
+        totals = [0] + list(itertools.accumulate(outcomes))
+        cumulative_win_percentage = [totals[i] / i for i in range(1, n + 1)]
+        rolling_win_percentage = [(totals[i] - totals[max(i - window, 0)]) / min(window, i)
+                                  for i in range(1, n + 1)]
+    else:
+        outcomes_array = numpy.fromiter((result == 'Guesser' for result in results), dtype=numpy.int64, count=n)
+        outcomes = outcomes_array.tolist()
+        totals = numpy.concatenate(([0], numpy.cumsum(outcomes_array)))
+        games = numpy.arange(1, n + 1)
+        cumulative_win_percentage = (totals[1:] / games).tolist()
+        rolling_win_percentage = ((totals[1:] - totals[numpy.maximum(games - window, 0)])
+                                  / numpy.minimum(window, games)).tolist()
+
+    return {'outcomes': outcomes,
+            'cumulative_win_percentage': cumulative_win_percentage,
+            'rolling_win_percentage': rolling_win_percentage}
+
+
+def save_game_statistics(results: list[str], path: str, window: int = DEFAULT_WINDOW) -> None:
+    """Save the series returned by game_statistics(results, window) to a CSV file at path, with a header
+    row followed by one row per game (numbered from 0).
+
+    Preconditions:
+        - all(r in {'Guesser', 'Adversary'} for r in results)
+        - window >= 1
+    """
+    statistics = game_statistics(results, window)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['game'] + list(statistics))
+        writer.writerows(zip(range(0, len(results)), *statistics.values()))
+
+
+def _decimate(values: list[float], max_points: Optional[int]) -> tuple[list[int], list[float]]:
+    """Return the indexes and values of at most max_points of the given values, chosen by min-max
+    decimation: the values are split into max_points // 2 ranges of consecutive indexes, and the smallest
+    and largest value of each range are kept (in index order).
+
+    If max_points is None or len(values) <= max_points, every value is returned.
+
+    >>> _decimate([0.0, 3.0, 1.0, 2.0, 5.0, 4.0], 4)
+    ([0, 1, 3, 4], [0.0, 3.0, 2.0, 5.0])
+
+    Preconditions:
+        - max_points is None or max_points >= 2
+    """
+    n = len(values)
+    if max_points is None or n <= max_points:
+        return list(range(0, n)), values
+
+    num_ranges = max_points // 2
+    indexes = []
+    for r in range(0, num_ranges):
+        start, end = r * n // num_ranges, (r + 1) * n // num_ranges
+        segment = values[start:end]
+        smallest = start + segment.index(min(segment))
+        largest = start + segment.index(max(segment))
+        indexes.extend(sorted({smallest, largest}))
+
+    return indexes, [values[i] for i in indexes]
+
+
 ###################################################################################################
 # Additional helper functions for Wordle rules (similar to CSC110 A2)
 # You do NOT need to access any of the functions in this section to complete this assignment.
@@ -479,6 +1064,55 @@ def _find_correct_answers(word_set: Iterable[str],
     return frozenset(word for word in word_set if _is_correct_multiple(word, guesses, statuses))
 
 
+def _decode_status(code: int, word_size: int) -> tuple[str, ...]:
+    """Return the status with the given pattern code for words of the given size.
+
+    >>> _decode_status(21, 5)
+    ('N', '?', 'Y', 'N', 'N')
+    """
+    return a2_moves.decode_status(a2_moves.status_code(code, word_size))
+
+
+def _partition_answers(candidates: a2_word_index.CandidateSet, guess: str,
+                       feedback: Optional[a2_feedback.FeedbackMatrix] = None) \
+        -> dict[int, a2_word_index.CandidateSet]:
+    """Return a mapping from the move code (see a2_moves) of each status of guess with respect to a word
+    in candidates to the words (from candidates) with that status.
+
+    If feedback is not None, the statuses are looked up in that feedback matrix.
+
+    Preconditions:
+    - all words in candidates have the same length as guess
+    - feedback is None or (guess in feedback and feedback.words == candidates.index.words)
+    """
+    index = candidates.index
+    ids_by_code = {}
+    if feedback is None:
+        for word_id in index.ids_of_mask(candidates.mask):
+            code = a2_feedback.pattern_code(index.words[word_id], guess)
+            ids_by_code.setdefault(code, []).append(word_id)
+    else:
+        row = feedback.row(feedback.word_id(guess))
+        for word_id in index.ids_of_mask(candidates.mask):
+            ids_by_code.setdefault(row[word_id], []).append(word_id)
+
+    return {a2_moves.status_code(code, len(guess)): a2_word_index.CandidateSet(index, index.mask_of_ids(ids))
+            for code, ids in ids_by_code.items()}
+
+
+def _pattern_digits(pattern: int, word_size: int) -> list[int]:
+    """Return the digits of the given pattern code, starting from position 0.
+
+    >>> _pattern_digits(21, 5)
+    [0, 1, 2, 0, 0]
+    """
+    digits = []
+    for _ in range(0, word_size):
+        pattern, digit = divmod(pattern, 3)
+        digits.append(digit)
+    return digits
+
+
 def _is_valid_status(status: Iterable[str]) -> bool:
     """Return whether s is a valid status.
 
@@ -0,0 +1,257 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Batch Simulation)
+
+Module Description
+==================
+
+This module contains a batch simulator for games between a RandomGuesser and a RandomAdversary, which
+we play in the millions to calibrate the other players. Instead of playing one game at a time with
+AdversarialWordle objects, simulate_random_games plays a whole batch of games in lockstep with NumPy:
+
+    - the possible answers of every game in the batch are stored together in one array of word ids,
+    - the random choices of every game in a round are drawn at once, and
+    - statuses are looked up in the word set's feedback matrix (see a2_feedback) as pattern codes.
+
+The players make the same choices (with the same probabilities) as RandomGuesser and RandomAdversary:
+the Guesser guesses a uniformly random possible answer, and the Adversary picks a uniformly random
+possible answer other than the guess (unless the guess is the only possible answer) and returns the
+status of the guess with respect to it. The random numbers come from a NumPy generator rather than the
+random module, so the games themselves differ from the games played by a2_adversarial_wordle.run_games
+with the same seed.
+
+This module requires NumPy.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import time
+from typing import Optional
+
+import numpy
+
+import a2_adversarial_wordle as aw
+import a2_feedback
+import a2_moves
+import a2_word_sets
+
+# The default number of games played in lockstep. The memory used is a few bytes per game per word.
+DEFAULT_BATCH_SIZE = 2048
+
+
+class BatchResults:
+    """The results of a sequence of games simulated by simulate_random_games.
+
+    Instance Attributes:
+        - words: the words of the word set the games were played with, indexed by id
+        - guesser_won: guesser_won[i] is whether the Guesser won game i
+        - num_guesses: num_guesses[i] is the number of guesses made in game i
+        - guesses: if the moves were recorded, guesses[i][j] is the id of guess j of game i
+          (or -1 if j >= num_guesses[i]); otherwise None
+        - patterns: if the moves were recorded, patterns[i][j] is the pattern code of status j of game i
+          (or -1 if j >= num_guesses[i]); otherwise None
+
+    Representation Invariants:
+        - len(self.guesser_won) == len(self.num_guesses)
+        - (self.guesses is None) == (self.patterns is None)
+    """
+    words: tuple[str, ...]
+    guesser_won: numpy.ndarray
+    num_guesses: numpy.ndarray
+    guesses: Optional[numpy.ndarray]
+    patterns: Optional[numpy.ndarray]
+
+    def __init__(self, words: tuple[str, ...], guesser_won: numpy.ndarray, num_guesses: numpy.ndarray,
+                 guesses: Optional[numpy.ndarray] = None, patterns: Optional[numpy.ndarray] = None) -> None:
+        """Initialize new results with the given attributes."""
+        self.words = words
+        self.guesser_won = guesser_won
+        self.num_guesses = num_guesses
+        self.guesses = guesses
+        self.patterns = patterns
+
+    def __len__(self) -> int:
+        """Return the number of games in these results."""
+        return len(self.guesser_won)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of games won by each player, in the same format as run_games."""
+        guesser_wins = int(numpy.count_nonzero(self.guesser_won))
+        return {'Guesser': guesser_wins, 'Adversary': len(self) - guesser_wins}
+
+    def winners(self) -> list[str]:
+        """Return the winner of each game, in the same format as the results of play_games."""
+        return ['Guesser' if won else 'Adversary' for won in self.guesser_won.tolist()]
+
+    def get_move_sequence(self, i: int) -> list[str | tuple[str, ...]]:
+        """Return the move sequence of game i, in the same format as AdversarialWordle.get_move_sequence.
+
+        Preconditions:
+            - self.guesses is not None
+            - 0 <= i < len(self)
+        """
+        word_size = len(self.words[0])
+        moves = []
+        for j in range(0, int(self.num_guesses[i])):
+            moves.append(self.words[self.guesses[i][j]])
+            moves.append(a2_moves.decode_status(a2_moves.status_code(int(self.patterns[i][j]), word_size)))
+        return moves
+
+
+def simulate_random_games(word_set_file: str, max_guesses: int, num_games: int,
+                          seed: Optional[int] = None, record_moves: bool = False,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> BatchResults:
+    """Simulate num_games games between a RandomGuesser and a RandomAdversary, and return their results.
+
+    The word_set_file and max_guesses parameters are the same as in a2_adversarial_wordle.run_game.
+    The games are played batch_size at a time, using a NumPy random generator seeded with seed.
+    If record_moves is True, the guesses and statuses of every game are recorded in the results.
+
+    >>> results = simulate_random_games('data/words/official_wordle_100.txt', 3, 1000, seed=111,
+    ...                                 record_moves=True)
+    >>> results.stats() == simulate_random_games('data/words/official_wordle_100.txt', 3, 1000, seed=111).stats()
+    True
+    >>> moves = results.get_move_sequence(0)
+    >>> len(moves) == 2 * int(results.num_guesses[0])
+    True
+    >>> (moves[-1] == ('Y',) * 5) == bool(results.guesser_won[0])
+    True
+
+    Preconditions:
+        - same preconditions for word_set_file and max_guesses as a2_adversarial_wordle.run_game
+        - num_games >= 1
+        - batch_size >= 1
+    """
+    feedback = a2_word_sets.load_word_set(word_set_file).feedback
+    n = len(feedback)
+    table = numpy.asarray(feedback.table()).reshape(n, n)
+    all_correct = a2_feedback.all_correct_code(feedback.word_size)
+    rng = numpy.random.default_rng(seed)
+
+    guesser_won = numpy.zeros(num_games, dtype=bool)
+    num_guesses = numpy.zeros(num_games, dtype=numpy.int32)
+    if record_moves:
+        guesses = numpy.full((num_games, max_guesses), -1, dtype=numpy.int32)
+        patterns = numpy.full((num_games, max_guesses), -1, dtype=numpy.int32)
+    else:
+        guesses, patterns = None, None
+
+    for start in range(0, num_games, batch_size):
+        stop = min(start + batch_size, num_games)
+        _simulate_batch(rng, table, max_guesses, all_correct, guesser_won[start:stop], num_guesses[start:stop],
+                        None if guesses is None else guesses[start:stop],
+                        None if patterns is None else patterns[start:stop])
+
+    return BatchResults(feedback.words, guesser_won, num_guesses, guesses, patterns)
+
+
+def _simulate_batch(rng: numpy.random.Generator, table: numpy.ndarray, max_guesses: int, all_correct: int,
+                    guesser_won: numpy.ndarray, num_guesses: numpy.ndarray,
+                    guesses: Optional[numpy.ndarray], patterns: Optional[numpy.ndarray]) -> None:
+    """Simulate len(guesser_won) games in lockstep, and store their results in the given arrays
+    (which are slices of the arrays of a BatchResults).
+
+    table[g][a] is the pattern code of guess id g with respect to answer id a.
+    """
+    n = len(table)
+    batch_size = len(guesser_won)
+
+    # The games that are still being played (as indexes into the result arrays) and the number of
+    # possible answers of each game. After the first round, the possible answers of all the games are
+    # stored in answer_ids, grouped by game: the possible answers of games[i] are
+    # answer_ids[offsets[i]:offsets[i] + counts[i]], and owners[j] is the i that answer_ids[j] belongs to.
+    # (In the first round, every word is a possible answer in every game.)
+    games = numpy.arange(batch_size)
+    counts = numpy.full(batch_size, n)
+    answer_ids, owners = None, None
+
+    for round_number in range(0, max_guesses):
+        if answer_ids is None:
+            # The Guesser picks any word, and the Adversary picks any word other than the guess
+            guess_ids = rng.integers(0, n, size=batch_size)
+            if n == 1:
+                chosen_ids = guess_ids
+            else:
+                chosen_ids = rng.integers(0, n - 1, size=batch_size)
+                chosen_ids += chosen_ids >= guess_ids
+        else:
+            offsets = numpy.cumsum(counts) - counts
+            guess_positions = _choose(rng, counts)
+            # The Adversary picks a position other than the guess's, unless the guess is the only possible answer
+            chosen_positions = _choose(rng, numpy.maximum(counts - 1, 1))
+            chosen_positions = numpy.where(counts == 1, guess_positions,
+                                           chosen_positions + (chosen_positions >= guess_positions))
+            guess_ids = answer_ids[offsets + guess_positions]
+            chosen_ids = answer_ids[offsets + chosen_positions]
+
+        round_patterns = table[guess_ids, chosen_ids]
+        if guesses is not None:
+            guesses[games, round_number] = guess_ids
+            patterns[games, round_number] = round_patterns
+        num_guesses[games] = round_number + 1
+
+        won = round_patterns == all_correct
+        guesser_won[games[won]] = True
+        playing = ~won
+        if round_number == max_guesses - 1 or not playing.any():
+            break
+
+        # The possible answers after the status are the ones with the same status for the guess
+        if answer_ids is None:
+            owners, answer_ids = numpy.nonzero(table[guess_ids[playing]] == round_patterns[playing, None])
+        else:
+            keep = playing[owners]
+            keep[keep] = table[guess_ids[owners[keep]], answer_ids[keep]] == round_patterns[owners[keep]]
+            new_indexes = numpy.cumsum(playing) - 1
+            owners, answer_ids = new_indexes[owners[keep]], answer_ids[keep]
+        games = games[playing]
+        counts = numpy.bincount(owners, minlength=len(games))
+
+
+def _choose(rng: numpy.random.Generator, counts: numpy.ndarray) -> numpy.ndarray:
+    """Return a uniformly random integer in range(0, counts[i]) for each i.
+
+    Preconditions:
+        - all(count >= 1 for count in counts)
+    """
+    choices = (rng.random(len(counts)) * counts).astype(numpy.int64)
+    return numpy.minimum(choices, counts - 1)
+
+
+def compare_with_play_games(word_set_file: str, max_guesses: int, num_games: int) -> dict[str, float]:
+    """Play num_games games between a RandomGuesser and a RandomAdversary both with
+    a2_adversarial_wordle.play_games and with simulate_random_games, and return the fraction of games
+    won by the Guesser and the time (in seconds) taken by each.
+
+    Preconditions:
+        - same preconditions for word_set_file and max_guesses as a2_adversarial_wordle.run_game
+        - num_games >= 1
+    """
+    a2_word_sets.load_word_set(word_set_file).feedback  # Load the word set and feedback matrix first
+
+    start = time.perf_counter()
+    stats, _ = aw.play_games(num_games, aw.RandomGuesser(), aw.RandomAdversary(), word_set_file, max_guesses)
+    play_games_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_stats = simulate_random_games(word_set_file, max_guesses, num_games).stats()
+    batch_seconds = time.perf_counter() - start
+
+    return {'play_games_win_rate': stats['Guesser'] / num_games, 'play_games_seconds': play_games_seconds,
+            'batch_win_rate': batch_stats['Guesser'] / num_games, 'batch_seconds': batch_seconds,
+            'speedup': play_games_seconds / batch_seconds}
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
+
+    # print(compare_with_play_games('data/words/official_wordle.txt', 6, 10000))
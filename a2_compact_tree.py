@@ -0,0 +1,560 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Compact Game Trees)
+
+Module Description
+==================
+
+This module contains an array-backed representation of game trees. Instead of one Python object
+(with its own instance dictionary, move, float and subtree dictionary) per node, a CompactGameTree
+stores all of its nodes in a few parallel arrays:
+
+    - the parent of each node,
+    - the range of each node's children (the nodes are numbered in breadth-first order, so the
+      children of every node are numbered consecutively),
+    - the id of each node's move in a table of distinct moves, and
+    - the guesser win probability of each node, as a 32-bit float.
+
+A CompactGameTree can be saved to a binary file and loaded again by memory-mapping the file, so that
+opening even a very large tree is almost instant and only the parts of the file that are used are read
+from disk. The file starts with a header and the table of distinct moves, followed by the four arrays
+in little-endian byte order.
+
+CompactNode is a thin view of one node of a CompactGameTree with the same interface that the players
+use from a2_game_tree.GameTree (move, move_code, guesser_win_probability, get_subtrees,
+find_subtree_by_move, find_subtree_by_code and is_guesser_turn), so a CompactNode can be passed to any
+of the tree-based players.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import array
+import math
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from typing import Optional
+
+import a2_game_tree
+import a2_moves
+
+# File layout: header, then the moves (utf-8, one per line, see _encode_move_line), then padding to a
+# multiple of 4 bytes, then the parents, child_starts, move_ids and probabilities arrays in that order.
+_MAGIC = b'A2GT'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHIII')  # magic, version, reserved, number of nodes, number of moves, moves length
+
+# The array typecodes of parents, child_starts, move_ids and probabilities (all 4 bytes per item)
+_TYPECODES = ('i', 'I', 'I', 'f')
+
+
+class CompactGameTree:
+    """An array-backed game tree.
+
+    Node 0 is the root, and the nodes are numbered in breadth-first order.
+
+    Instance Attributes:
+        - moves: the distinct moves that appear in the tree; the move of node i is moves[self.move_ids[i]]
+        - parents: parents[i] is the number of the parent of node i, or -1 if i is the root
+        - child_starts: the children of node i are the nodes numbered child_starts[i] to child_starts[i + 1] - 1
+        - move_ids: move_ids[i] is the index in moves of the move of node i
+        - probabilities: probabilities[i] is the guesser win probability of node i
+
+    Representation Invariants:
+        - len(self.parents) == len(self.move_ids) == len(self.probabilities) == len(self.child_starts) - 1
+        - len(self.parents) >= 1 and self.parents[0] == -1
+        - all(self.parents[j] == i for i in range(len(self.parents))
+              for j in range(self.child_starts[i], self.child_starts[i + 1]))
+    """
+    moves: list[str | tuple[str, ...]]
+    parents: array.array
+    child_starts: array.array
+    move_ids: array.array
+    probabilities: array.array
+
+    # Private Instance Attributes:
+    #   - _move_codes: the move codes (see a2_moves) of self.moves, in the same order
+    #   - _move_ids_by_code: the inverse of self._move_codes
+    #   - _mmap: the memory map that the arrays are views of, or None if they are stored in memory
+    _move_codes: list[int]
+    _move_ids_by_code: dict[int, int]
+    _mmap: Optional[mmap.mmap]
+
+    def __init__(self, moves: list[str | tuple[str, ...]], parents: array.array | memoryview,
+                 child_starts: array.array | memoryview, move_ids: array.array | memoryview,
+                 probabilities: array.array | memoryview, mapped: Optional[mmap.mmap] = None) -> None:
+        """Initialize a new compact game tree from its arrays.
+
+        Preconditions:
+            - the arguments satisfy the representation invariants of this class
+        """
+        self.moves = moves
+        self.parents = parents
+        self.child_starts = child_starts
+        self.move_ids = move_ids
+        self.probabilities = probabilities
+        self._mmap = mapped
+        self._move_codes = [a2_moves.encode_move(move) for move in moves]
+        self._move_ids_by_code = {code: i for i, code in enumerate(self._move_codes)}
+
+    @classmethod
+    def from_game_tree(cls, tree: a2_game_tree.GameTree) -> CompactGameTree:
+        """Return a compact copy of the given game tree.
+
+        A GameTree object that appears in several places in tree (see a2_part2.TranspositionTable) is
+        copied once for every place it appears.
+
+        >>> tree = a2_game_tree.GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N'), 'words'], 1.0)
+        >>> tree.insert_move_sequence(['world'])
+        >>> compact = CompactGameTree.from_game_tree(tree)
+        >>> len(compact)
+        5
+        >>> list(compact.parents), list(compact.child_starts)
+        ([-1, 0, 0, 1, 3], [1, 3, 4, 4, 5, 5])
+        >>> str(compact.to_game_tree()) == str(tree)
+        True
+        """
+        moves = []
+        move_ids_by_move = {}
+        parents = array.array('i')
+        child_starts = array.array('I')
+        move_ids = array.array('I')
+        probabilities = array.array('f')
+
+        nodes = [tree]
+        parents.append(-1)
+        for i, node in enumerate(nodes):  # nodes grows as the children of each node are added
+            if node.move not in move_ids_by_move:
+                move_ids_by_move[node.move] = len(moves)
+                moves.append(node.move)
+            move_ids.append(move_ids_by_move[node.move])
+            probabilities.append(node.guesser_win_probability)
+
+            child_starts.append(len(nodes))
+            for subtree in node.get_subtrees():
+                nodes.append(subtree)
+                parents.append(i)
+            nodes[i] = None  # let the original node be garbage collected once the copy is done
+        child_starts.append(len(nodes))
+
+        return cls(moves, parents, child_starts, move_ids, probabilities)
+
+    def to_game_tree(self) -> a2_game_tree.GameTree:
+        """Return a new GameTree with the same structure, moves and guesser win probabilities as this tree.
+        """
+        nodes = [a2_game_tree.GameTree(self.moves[move_id], probability)
+                 for move_id, probability in zip(self.move_ids, self.probabilities)]
+        for i, node in enumerate(nodes):
+            probability = node.guesser_win_probability
+            for child in range(self.child_starts[i], self.child_starts[i + 1]):
+                node.add_subtree(nodes[child])
+            # add_subtree recalculates the probability, so the stored probability is restored afterwards
+            node.guesser_win_probability = probability
+        return nodes[0]
+
+    def __len__(self) -> int:
+        """Return the number of nodes in this tree."""
+        return len(self.parents)
+
+    def root(self) -> CompactNode:
+        """Return a view of the root of this tree."""
+        return CompactNode(self, 0)
+
+    def move_id(self, move_code: int) -> int:
+        """Return the id of the move with the given move code, or -1 if no node of this tree has that move."""
+        return self._move_ids_by_code.get(move_code, -1)
+
+    def memory_usage(self) -> int:
+        """Return the approximate number of bytes used by this tree's arrays and move table.
+
+        The moves themselves are not counted, since they are shared with the rest of the program.
+        (For a memory-mapped tree, the arrays are counted even though they are only read from disk
+        as they are used.)
+        """
+        arrays = (self.parents, self.child_starts, self.move_ids, self.probabilities)
+        return sum(len(values) * values.itemsize for values in arrays) + sys.getsizeof(self.moves) + \
+            sys.getsizeof(self._move_codes) + sys.getsizeof(self._move_ids_by_code)
+
+    def is_memory_mapped(self) -> bool:
+        """Return whether this tree is backed by a memory-mapped file."""
+        return self._mmap is not None
+
+    def save(self, path: str) -> None:
+        """Save this tree to the file at path.
+
+        The file is written under a temporary name and then renamed, so that other processes never
+        see a partially written tree.
+
+        >>> import tempfile
+        >>> tree = a2_game_tree.GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N'), 'words'], 1.0)
+        >>> tree.insert_move_sequence(['world'], 0.5)
+        >>> path = os.path.join(tempfile.mkdtemp(), 'tree.a2gt')
+        >>> CompactGameTree.from_game_tree(tree).save(path)
+        >>> loaded = CompactGameTree.load(path)
+        >>> loaded.is_memory_mapped()
+        True
+        >>> str(loaded.to_game_tree()) == str(tree)
+        True
+        >>> [subtree.guesser_win_probability for subtree in loaded.root().get_subtrees()]
+        [1.0, 0.5]
+
+        A larger random tree keeps its structure and probabilities (up to 32-bit precision) after a
+        round trip through save, load and to_game_tree:
+
+        >>> import random
+        >>> random.seed(111)
+        >>> random_tree = a2_game_tree.GameTree()
+        >>> for _ in range(0, 200):
+        ...     moves = a2_game_tree._random_move_sequence(8)
+        ...     random_tree.insert_move_sequence(moves, random.choice([0.0, 0.25, 1.0]))
+        >>> CompactGameTree.from_game_tree(random_tree).save(path)
+        >>> _same_trees(CompactGameTree.load(path).to_game_tree(), random_tree)
+        True
+        """
+        moves_bytes = '\n'.join(_encode_move_line(move) for move in self.moves).encode('utf-8')
+        header = _HEADER.pack(_MAGIC, _VERSION, 0, len(self), len(self.moves), len(moves_bytes))
+        padding = -(len(header) + len(moves_bytes)) % 4
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(moves_bytes)
+            f.write(b'\0' * padding)
+            for typecode, values in zip(_TYPECODES, (self.parents, self.child_starts, self.move_ids,
+                                                     self.probabilities)):
+                values = array.array(typecode, values)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                f.write(values.tobytes())
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def load(path: str) -> CompactGameTree:
+        """Return the tree saved in the file at path, memory-mapping its arrays.
+
+        Raises ValueError if the file is not a game tree saved by CompactGameTree.save, or if its length
+        does not match the length given by its header (for example, because it was truncated).
+
+        >>> import tempfile
+        >>> tree = a2_game_tree.GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N'), 'words'], 1.0)
+        >>> directory = tempfile.mkdtemp()
+        >>> path = os.path.join(directory, 'tree.a2gt')
+        >>> CompactGameTree.from_game_tree(tree).save(path)
+        >>> with open(path, 'rb') as f:
+        ...     contents = f.read()
+        >>> bad_path = os.path.join(directory, 'bad.a2gt')
+        >>> for bad_contents in [contents[:-4], contents + b'extra', contents[:10], b'', b'XXXX' + contents[4:]]:
+        ...     with open(bad_path, 'wb') as f:
+        ...         _ = f.write(bad_contents)
+        ...     try:
+        ...         CompactGameTree.load(bad_path)
+        ...     except ValueError as error:
+        ...         print(str(error).replace(bad_path, 'bad.a2gt'))
+        bad.a2gt has 104 bytes, but its header describes 108 bytes (it may be truncated)
+        bad.a2gt has 113 bytes, but its header describes 108 bytes (it may be truncated)
+        bad.a2gt is not a version 1 game tree file
+        bad.a2gt is not a version 1 game tree file
+        bad.a2gt is not a version 1 game tree file
+        """
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # The file is empty
+                raise ValueError(f'{path} is not a version {_VERSION} game tree file') from None
+
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            raise ValueError(f'{path} is not a version {_VERSION} game tree file')
+        magic, version, _, num_nodes, num_moves, moves_length = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or version != _VERSION:
+            mapped.close()
+            raise ValueError(f'{path} is not a version {_VERSION} game tree file')
+
+        moves_start = _HEADER.size
+        moves_end = moves_start + moves_length
+        # The four arrays have num_nodes, num_nodes + 1, num_nodes and num_nodes items of 4 bytes each
+        expected_size = moves_end + (-moves_end % 4) + 4 * (4 * num_nodes + 1)
+        if len(mapped) != expected_size:
+            size = len(mapped)
+            mapped.close()
+            raise ValueError(f'{path} has {size} bytes, but its header describes {expected_size} bytes '
+                             f'(it may be truncated)')
+
+        try:
+            moves = [_decode_move_line(line) for line in mapped[moves_start:moves_end].decode('utf-8').split('\n')]
+        except UnicodeDecodeError:
+            moves = []
+        if len(moves) != num_moves:
+            mapped.close()
+            raise ValueError(f'{path} has a corrupted move table')
+
+        start = moves_end + (-moves_end % 4)
+        arrays = []
+        for typecode, length in zip(_TYPECODES, (num_nodes, num_nodes + 1, num_nodes, num_nodes)):
+            if sys.byteorder == 'little':
+                arrays.append(memoryview(mapped)[start:start + 4 * length].cast(typecode))
+            else:
+                values = array.array(typecode, mapped[start:start + 4 * length])
+                values.byteswap()
+                arrays.append(values)
+            start += 4 * length
+
+        if sys.byteorder != 'little':
+            mapped.close()
+            mapped = None
+        return CompactGameTree(moves, *arrays, mapped=mapped)
+
+
+class CompactNode:
+    """A view of a single node of a CompactGameTree, with the interface the players use from GameTree.
+
+    Instance Attributes:
+        - tree: the compact tree that this node belongs to
+        - index: the number of this node in tree
+    """
+    __slots__ = ('tree', 'index')
+    tree: CompactGameTree
+    index: int
+
+    def __init__(self, tree: CompactGameTree, index: int) -> None:
+        """Initialize a view of node number index in tree."""
+        self.tree = tree
+        self.index = index
+
+    @property
+    def move(self) -> str | tuple[str, ...]:
+        """The move of this node."""
+        return self.tree.moves[self.tree.move_ids[self.index]]
+
+    @property
+    def move_code(self) -> int:
+        """The move code of this node's move (see a2_moves)."""
+        return self.tree._move_codes[self.tree.move_ids[self.index]]
+
+    @property
+    def guesser_win_probability(self) -> float:
+        """The guesser win probability of this node."""
+        return self.tree.probabilities[self.index]
+
+    def get_subtrees(self) -> list[CompactNode]:
+        """Return (views of) the children of this node."""
+        tree = self.tree
+        return [CompactNode(tree, child) for child in range(tree.child_starts[self.index],
+                                                            tree.child_starts[self.index + 1])]
+
+    def find_subtree_by_move(self, move: str | tuple[str, ...]) -> Optional[CompactNode]:
+        """Return (a view of) the child of this node with the given move.
+
+        Return None if no child has that move.
+        """
+        return self.find_subtree_by_code(a2_moves.encode_move(move))
+
+    def find_subtree_by_code(self, move_code: int) -> Optional[CompactNode]:
+        """Return (a view of) the child of this node whose move has the given move code.
+
+        Return None if no child has that move.
+        """
+        tree = self.tree
+        move_id = tree.move_id(move_code)
+        for child in range(tree.child_starts[self.index], tree.child_starts[self.index + 1]):
+            if tree.move_ids[child] == move_id:
+                return CompactNode(tree, child)
+        return None
+
+    def is_guesser_turn(self) -> bool:
+        """Return whether the NEXT move should be made by the Guesser."""
+        # Only GAME_START_MOVE and statuses have negative move codes
+        return self.move_code < 0
+
+    def __len__(self) -> int:
+        """Return the number of nodes in the subtree rooted at this node."""
+        tree = self.tree
+        count = 0
+        stack = [self.index]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(range(tree.child_starts[node], tree.child_starts[node + 1]))
+        return count
+
+
+def save_game_tree(tree: a2_game_tree.GameTree, path: str) -> None:
+    """Save the given game tree to the file at path, in the format of CompactGameTree.save.
+
+    Load it again with CompactGameTree.load (and call to_game_tree on the result if an object tree
+    is needed, for example to keep inserting move sequences into it).
+
+    A tree whose equivalent game states share subtrees (see a2_part2.TranspositionTable) is saved as the
+    equivalent tree without sharing:
+
+    >>> import tempfile
+    >>> import a2_adversarial_wordle as aw
+    >>> import a2_part2
+    >>> game = aw.AdversarialWordle({'aaa', 'aab', 'aac', 'bbb', 'abc'}, 3)
+    >>> table = a2_part2.TranspositionTable()
+    >>> shared_tree = a2_part2.generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, 4, transpositions=table)
+    >>> table.get_stats()['hits'] > 0
+    True
+    >>> path = os.path.join(tempfile.mkdtemp(), 'tree.a2gt')
+    >>> save_game_tree(shared_tree, path)
+    >>> unshared_tree = a2_part2.generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, 4)
+    >>> loaded = CompactGameTree.load(path)
+    >>> len(loaded) == len(unshared_tree)
+    True
+    >>> _same_trees(loaded.to_game_tree(), unshared_tree)
+    True
+    """
+    CompactGameTree.from_game_tree(tree).save(path)
+
+
+def _encode_move_line(move: str | tuple[str, ...]) -> str:
+    """Return the line that represents move in a saved game tree.
+
+    Guesses (and GAME_START_MOVE) are written as they are, and statuses are written as their
+    character statuses, after a ':'.
+    """
+    if isinstance(move, str):
+        return move
+    return ':' + ''.join(move)
+
+
+def _decode_move_line(line: str) -> str | tuple[str, ...]:
+    """Return the move represented by the given line of a saved game tree.
+
+    >>> _decode_move_line(_encode_move_line(('N', '?', 'Y', 'N', 'N')))
+    ('N', '?', 'Y', 'N', 'N')
+    """
+    if line.startswith(':'):
+        return a2_moves.decode_status(a2_moves.encode_status(tuple(line[1:])))
+    return line
+
+
+def _same_trees(tree1: a2_game_tree.GameTree, tree2: a2_game_tree.GameTree) -> bool:
+    """Return whether the two trees have the same structure and moves (with the subtrees of each node in
+    the same order), and the same guesser win probabilities up to the precision of a 32-bit float.
+    """
+    nodes1 = list(tree1.iter_preorder())
+    nodes2 = list(tree2.iter_preorder())
+    return len(nodes1) == len(nodes2) and all(
+        node1.move == node2.move and depth1 == depth2
+        and math.isclose(node1.guesser_win_probability, node2.guesser_win_probability, rel_tol=1e-6, abs_tol=1e-7)
+        for (node1, depth1), (node2, depth2) in zip(nodes1, nodes2))
+
+
+def object_tree_memory_usage(tree: a2_game_tree.GameTree) -> int:
+    """Return the approximate number of bytes used by the nodes of the given (object-based) game tree.
+
+    Each node is counted with its instance dictionary, its subtree dictionary and its probability.
+    As in CompactGameTree.memory_usage, the moves themselves are not counted.
+    """
+    total = 0
+    for node, _ in tree.iter_preorder():
+        total += sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node._subtrees) + \
+            sys.getsizeof(node.guesser_win_probability)
+    return total
+
+
+def compare_memory(tree: a2_game_tree.GameTree) -> dict[str, float]:
+    """Return the number of nodes in tree and the approximate memory used by its object-based and
+    compact representations.
+
+    >>> import a2_adversarial_wordle as aw
+    >>> import a2_part2
+    >>> game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+    >>> results = compare_memory(a2_part2.generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, 3))
+    >>> results['nodes']
+    16
+    >>> results['compact_bytes'] < results['object_bytes']
+    True
+    """
+    compact = CompactGameTree.from_game_tree(tree)
+    object_bytes = object_tree_memory_usage(tree)
+    compact_bytes = compact.memory_usage()
+    return {'nodes': len(compact), 'object_bytes': object_bytes, 'compact_bytes': compact_bytes,
+            'ratio': object_bytes / compact_bytes}
+
+
+def compare_with_pickle(tree: a2_game_tree.GameTree, directory: str) -> dict[str, float]:
+    """Save tree to a file in the given directory both with pickle and with CompactGameTree.save, and
+    return the size of each file (in bytes) and the time (in seconds) taken to save and load it.
+
+    >>> import tempfile
+    >>> import a2_adversarial_wordle as aw
+    >>> import a2_part2
+    >>> game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+    >>> tree = a2_part2.generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, 3)
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     results = compare_with_pickle(tree, directory)
+    >>> results['compact_bytes'] < results['pickle_bytes']
+    True
+    """
+    results = {}
+
+    pickle_path = os.path.join(directory, 'tree.pickle')
+    start = time.perf_counter()
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+    results['pickle_save_seconds'] = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(pickle_path, 'rb') as f:
+        pickle.load(f)
+    results['pickle_load_seconds'] = time.perf_counter() - start
+    results['pickle_bytes'] = os.path.getsize(pickle_path)
+
+    compact_path = os.path.join(directory, 'tree.a2gt')
+    start = time.perf_counter()
+    save_game_tree(tree, compact_path)
+    results['compact_save_seconds'] = time.perf_counter() - start
+    start = time.perf_counter()
+    CompactGameTree.load(compact_path)
+    results['compact_load_seconds'] = time.perf_counter() - start
+    results['compact_bytes'] = os.path.getsize(compact_path)
+
+    return results
+
+
+def memory_benchmark(word_set_file: str = 'data/words/official_wordle_100.txt', max_guesses: int = 4,
+                     depth: int = 6) -> dict[str, float]:
+    """Generate the complete game tree of the given depth for a game with the given word set file and
+    maximum number of guesses, print the results of compare_memory for it, and return them.
+
+    With the default arguments (a depth of 6, or three full rounds), the tree has about 750,000 nodes,
+    and the compact tree uses about 20 times less memory than the object-based tree.
+
+    Preconditions:
+        - same preconditions for word_set_file and max_guesses as a2_adversarial_wordle.run_game
+        - depth >= 0
+    """
+    import a2_adversarial_wordle as aw
+    import a2_part2
+    import a2_word_sets
+
+    word_set = a2_word_sets.load_word_set(word_set_file)
+    game = aw.AdversarialWordle(word_set, max_guesses, word_set.feedback)
+    tree = a2_part2.generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, depth)
+    results = compare_memory(tree)
+    print(f'depth {depth}: {results["nodes"]} nodes, object tree {results["object_bytes"] / 2 ** 20:.1f} MiB, '
+          f'compact tree {results["compact_bytes"] / 2 ** 20:.1f} MiB ({results["ratio"]:.1f}x smaller)')
+    return results
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
+
+    # Memory comparison on a complete game tree of depth 6 (three full rounds), which takes under a minute
+    memory_benchmark()
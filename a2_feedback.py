@@ -0,0 +1,408 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Feedback Matrices)
+
+Module Description
+==================
+
+This module contains functions for precomputing the status of every guess with respect to
+every answer in an Adversarial Wordle word set, which we call the word set's *feedback matrix*.
+
+Each status is stored as a single integer called a *pattern code*. The character status at
+position i of a guess contributes the digit 0 (INCORRECT), 1 (WRONG_POSITION) or 2 (CORRECT)
+multiplied by 3 ** i, so for five-letter words every pattern code fits in a single byte.
+
+Feedback matrices can be saved to disk in a cache directory, under a name based on the word file's
+content hash, and are memory-mapped when loaded again so that only the rows that are actually used are
+read from disk. The cache directory is the value of the environment variable A2_FEEDBACK_CACHE_DIR if
+it is set, and a directory in the system's temporary directory otherwise; it can be changed (or the
+disk cache turned off) with set_cache_dir. If the cache directory cannot be written to, feedback
+matrices are computed in memory instead.
+
+By default, then, every a2_adversarial_wordle.run_game (and everything that loads a word set's feedback
+matrix) saves its word set's matrix to a2_feedback_cache in the system's temporary directory, unless a
+matrix for the same word file content is already saved there.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Angela Zavaleta Bernuy.
+"""
+from __future__ import annotations
+import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from types import ModuleType
+from typing import Any, Iterable, Optional
+
+INCORRECT_DIGIT = 0
+WRONG_POSITION_DIGIT = 1
+CORRECT_DIGIT = 2
+
+# The environment variable that sets the directory where feedback matrices are saved
+CACHE_DIR_VARIABLE = 'A2_FEEDBACK_CACHE_DIR'
+
+# The directory where feedback matrices are saved, or None if they are not saved (see set_cache_dir)
+_cache_dir: Optional[str] = os.environ.get(CACHE_DIR_VARIABLE,
+                                           os.path.join(tempfile.gettempdir(), 'a2_feedback_cache'))
+
+# File layout: header, then the words (utf-8, newline-separated), then padding to a multiple of
+# the item size, then the table itself in little-endian byte order.
+_MAGIC = b'A2FM'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHIII')  # magic, version, item size, word size, number of words, words length
+
+# Feedback matrices that have already been loaded in this process, keyed by word file content hash
+_loaded_matrices: dict[str, FeedbackMatrix] = {}
+
+
+class FeedbackMatrix:
+    """A table of the pattern codes for every (guess, answer) pair of words in a word set.
+
+    Each word is identified by its *id*, which is its index in self.words.
+
+    Instance Attributes:
+        - words: the words in the word set, in sorted order
+        - word_size: the length of the words in the word set
+
+    Representation Invariants:
+        - len(self.words) > 0
+        - list(self.words) == sorted(set(self.words))
+        - all(len(word) == self.word_size for word in self.words)
+        - len(self._table) == len(self.words) ** 2
+    """
+    words: tuple[str, ...]
+    word_size: int
+
+    # Private Instance Attributes:
+    #   - _ids: a mapping from each word to its id
+    #   - _table: the pattern codes in row-major order, where _table[g * len(words) + a] is the pattern
+    #             code of the word with id g (the guess) with respect to the word with id a (the answer)
+    #   - _mmap: the memory map that _table is a view of, or None if _table is stored in memory
+    #   - _path: the path of the file that _mmap maps, or None if _table is stored in memory
+    _ids: dict[str, int]
+    _table: memoryview | array.array
+    _mmap: Optional[mmap.mmap]
+    _path: Optional[str]
+
+    def __init__(self, words: tuple[str, ...], table: memoryview | array.array,
+                 mapped: Optional[mmap.mmap] = None, path: Optional[str] = None) -> None:
+        """Initialize a new feedback matrix for the given words and table of pattern codes.
+
+        If mapped is not None, table is a view of mapped, which maps the file at path.
+
+        Preconditions:
+            - words and table satisfy the representation invariants of this class
+            - (mapped is None) == (path is None)
+        """
+        self.words = words
+        self.word_size = len(words[0])
+        self._ids = {word: i for i, word in enumerate(words)}
+        self._table = table
+        self._mmap = mapped
+        self._path = path
+
+    def __reduce__(self) -> tuple:
+        """Return the information needed to pickle this feedback matrix.
+
+        A memory-mapped matrix is pickled as the path of its file, which is mapped again when it is
+        unpickled (memory maps themselves cannot be pickled).
+
+        >>> import pickle
+        >>> import tempfile
+        >>> matrix = compute_feedback_matrix(['hello', 'words', 'world'])
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     save_feedback_matrix(matrix, os.path.join(directory, 'matrix.fbm'))
+        ...     mapped_matrix = open_feedback_matrix(os.path.join(directory, 'matrix.fbm'))
+        ...     copy = pickle.loads(pickle.dumps(mapped_matrix))
+        ...     (copy.is_memory_mapped(), list(copy.table()) == list(matrix.table()))
+        (True, True)
+        >>> list(pickle.loads(pickle.dumps(matrix)).table()) == list(matrix.table())
+        True
+        """
+        if self._mmap is not None:
+            return (open_feedback_matrix, (self._path,))
+        else:
+            return (FeedbackMatrix, (self.words, self._table))
+
+    def __len__(self) -> int:
+        """Return the number of words in this feedback matrix."""
+        return len(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        """Return whether the given word is in this feedback matrix."""
+        return word in self._ids
+
+    def is_memory_mapped(self) -> bool:
+        """Return whether this feedback matrix is backed by a memory-mapped file."""
+        return self._mmap is not None
+
+    def word_id(self, word: str) -> int:
+        """Return the id of the given word.
+
+        Preconditions:
+            - word in self
+        """
+        return self._ids[word]
+
+    def pattern(self, guess: str, answer: str) -> int:
+        """Return the pattern code of guess with respect to answer.
+
+        Preconditions:
+            - guess in self
+            - answer in self
+        """
+        return self._table[self._ids[guess] * len(self.words) + self._ids[answer]]
+
+    def pattern_by_id(self, guess_id: int, answer_id: int) -> int:
+        """Return the pattern code of the word with id guess_id with respect to the word with id answer_id.
+
+        Preconditions:
+            - 0 <= guess_id < len(self)
+            - 0 <= answer_id < len(self)
+        """
+        return self._table[guess_id * len(self.words) + answer_id]
+
+    def table(self) -> memoryview | array.array:
+        """Return the pattern codes of every (guess, answer) pair in row-major order, so that the pattern
+        code of guess id g with respect to answer id a is at index g * len(self) + a.
+
+        Do not mutate the returned table.
+        """
+        return self._table
+
+    def row(self, guess_id: int) -> memoryview | array.array:
+        """Return the pattern codes of the word with id guess_id with respect to every answer, in id order.
+
+        Preconditions:
+            - 0 <= guess_id < len(self)
+        """
+        n = len(self.words)
+        return self._table[guess_id * n:(guess_id + 1) * n]
+
+
+def pattern_code(answer: str, guess: str) -> int:
+    """Return the pattern code of the given guess with respect to answer.
+
+    A character of guess that is not CORRECT is WRONG_POSITION exactly when it is equal to some
+    character of answer at a position that is not CORRECT, which is the same rule that
+    a2_adversarial_wordle._get_guess_status uses.
+
+    Preconditions:
+        - len(answer) == len(guess)
+
+    >>> pattern_code('hello', 'hello') == 3 ** 5 - 1
+    True
+    >>> pattern_code('reach', 'brawl')  # ('N', '?', 'Y', 'N', 'N')
+    21
+    """
+    mismatched = [a for a, g in zip(answer, guess) if a != g]
+    code = 0
+    power = 1
+    for a, g in zip(answer, guess):
+        if a == g:
+            code += CORRECT_DIGIT * power
+        elif g in mismatched:
+            code += WRONG_POSITION_DIGIT * power
+        power *= 3
+    return code
+
+
+def all_correct_code(word_size: int) -> int:
+    """Return the pattern code of the "all CORRECT" status for words of the given size.
+
+    >>> all_correct_code(5)
+    242
+    """
+    return 3 ** word_size - 1
+
+
+def compute_feedback_matrix(words: Iterable[str]) -> FeedbackMatrix:
+    """Return a new in-memory feedback matrix for the given words.
+
+    Uses NumPy to compute the table when it is installed, and plain Python otherwise.
+
+    Preconditions:
+        - words is non-empty
+        - all words have the same length
+    """
+    sorted_words = tuple(sorted(set(words)))
+    typecode = _typecode_for(len(sorted_words[0]))
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is None:
+        table = array.array(typecode, [pattern_code(answer, guess)
+                                       for guess in sorted_words for answer in sorted_words])
+    else:
+        table = array.array(typecode, _compute_table_numpy(numpy, sorted_words, typecode).tobytes())
+
+    return FeedbackMatrix(sorted_words, table)
+
+
+def get_cache_dir() -> Optional[str]:
+    """Return the directory where feedback matrices are saved, or None if they are not saved."""
+    return _cache_dir
+
+
+def set_cache_dir(cache_dir: Optional[str]) -> None:
+    """Set the directory where load_feedback_matrix saves feedback matrices.
+
+    If cache_dir is None, feedback matrices are computed in memory and never saved.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def load_feedback_matrix(word_set_file: str, cache_dir: Optional[str] = None) -> FeedbackMatrix:
+    """Return the feedback matrix for the words in word_set_file.
+
+    If a feedback matrix for a word file with the same contents has already been saved in cache_dir,
+    it is memory-mapped rather than recomputed. Otherwise, the feedback matrix is computed and saved
+    in cache_dir before being returned (and only kept in memory if it cannot be saved). Matrices are
+    also cached in memory, so loading the same word file more than once in a process does not touch
+    the disk again.
+
+    cache_dir defaults to get_cache_dir(); if both are None, nothing is saved.
+
+    Preconditions:
+        - word_set_file is a non-empty file with one word per line
+        - all words in word_set_file have the same length
+    """
+    with open(word_set_file, 'rb') as f:
+        contents = f.read()
+
+    digest = hashlib.sha256(contents).hexdigest()
+    if digest in _loaded_matrices:
+        return _loaded_matrices[digest]
+
+    if cache_dir is None:
+        cache_dir = _cache_dir
+    path = None if cache_dir is None else os.path.join(cache_dir, f'{digest[:32]}.fbm')
+
+    if path is not None and os.path.exists(path):
+        matrix = open_feedback_matrix(path)
+    else:
+        words = {line.strip().lower() for line in contents.decode('utf-8').splitlines()}
+        words.discard('')
+        matrix = compute_feedback_matrix(words)
+        if path is not None:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                save_feedback_matrix(matrix, path)
+            except OSError:
+                # The cache directory is not writable, so the matrix is only kept in memory
+                pass
+
+    _loaded_matrices[digest] = matrix
+    return matrix
+
+
+def save_feedback_matrix(matrix: FeedbackMatrix, path: str) -> None:
+    """Save the given feedback matrix to the file at path.
+
+    The file is written under a temporary name and then renamed, so that other processes never
+    see a partially written matrix.
+    """
+    itemsize = array.array(_typecode_for(matrix.word_size)).itemsize
+    words_bytes = '\n'.join(matrix.words).encode('utf-8')
+    header = _HEADER.pack(_MAGIC, _VERSION, itemsize, matrix.word_size, len(matrix.words), len(words_bytes))
+    padding = -(len(header) + len(words_bytes)) % itemsize
+
+    table = array.array(_typecode_for(matrix.word_size), bytes(matrix._table))
+    if sys.byteorder != 'little':
+        table.byteswap()
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(words_bytes)
+        f.write(b'\0' * padding)
+        f.write(table.tobytes())
+    os.replace(temp_path, path)
+
+
+def open_feedback_matrix(path: str) -> FeedbackMatrix:
+    """Return the feedback matrix saved in the file at path, memory-mapping its table.
+
+    Raises ValueError if the file is not a feedback matrix saved by save_feedback_matrix.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, itemsize, word_size, num_words, words_length = _HEADER.unpack_from(mapped, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f'{path} is not a version {_VERSION} feedback matrix file')
+
+    words_start = _HEADER.size
+    words_end = words_start + words_length
+    words = tuple(mapped[words_start:words_end].decode('utf-8').split('\n'))
+    table_start = words_end + (-words_end % itemsize)
+    typecode = _typecode_for(word_size)
+
+    if sys.byteorder == 'little':
+        table = memoryview(mapped)[table_start:table_start + itemsize * num_words ** 2].cast(typecode)
+        return FeedbackMatrix(words, table, mapped, os.path.abspath(path))
+    else:
+        table = array.array(typecode, mapped[table_start:table_start + itemsize * num_words ** 2])
+        table.byteswap()
+        mapped.close()
+        return FeedbackMatrix(words, table)
+
+
+def _typecode_for(word_size: int) -> str:
+    """Return the smallest array typecode that can store every pattern code for words of the given size."""
+    max_code = all_correct_code(word_size)
+    if max_code < 2 ** 8:
+        return 'B'
+    elif max_code < 2 ** 16:
+        return 'H'
+    elif max_code < 2 ** 32:
+        return 'I'
+    else:
+        return 'Q'
+
+
+def _compute_table_numpy(numpy: ModuleType, words: tuple[str, ...], typecode: str) -> Any:
+    """Return the table of pattern codes for words as a flat NumPy array (of the given typecode), using the
+    same rule as pattern_code.
+
+    numpy is the numpy module, which is passed in because it is an optional dependency.
+    """
+    word_size = len(words[0])
+    letters = numpy.array([[ord(char) for char in word] for word in words], dtype=numpy.int32)
+    n = len(words)
+    table = numpy.empty((n, n), dtype=numpy.dtype(typecode))
+    # matches[c][j] is a boolean array saying which answers have the letter c at position j
+    matches = {}
+
+    for guess_id in range(n):
+        guess = letters[guess_id].tolist()
+        for char in guess:
+            if char not in matches:
+                matches[char] = [letters[:, j] == char for j in range(word_size)]
+
+        correct = [matches[guess[j]][j] for j in range(word_size)]
+        codes = numpy.zeros(n, dtype=numpy.int32)
+        for i in range(word_size):
+            wrong_position = numpy.zeros(n, dtype=bool)
+            for j in range(word_size):
+                if j != i:
+                    wrong_position |= matches[guess[i]][j] & ~correct[j]
+            digits = numpy.where(correct[i], CORRECT_DIGIT,
+                                 numpy.where(wrong_position, WRONG_POSITION_DIGIT, INCORRECT_DIGIT))
+            codes += digits * 3 ** i
+        table[guess_id] = codes
+
+    return table.reshape(-1)
@@ -0,0 +1,293 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Game Records)
+
+Module Description
+==================
+
+This module contains GameRecord, a compact summary of one finished game of Adversarial Wordle, and the
+*sinks* that a2_adversarial_wordle.run_games can send game records to as the games are played:
+
+    - MemorySink keeps the results of every game in arrays (and optionally the move sequences),
+    - CsvSink writes the move sequence of every game to a CSV file, in the format that
+      a2_part1.load_game_tree reads, so that simulated games can be loaded into a game tree,
+    - JsonlSink writes every record to a file as one line of JSON, and
+    - ProgressReporter prints every n-th game (and every game if n == 1).
+
+The records themselves can also be consumed one at a time with a2_adversarial_wordle.iter_game_records.
+
+In a game record, the move sequence is *encoded* as the cells of a row of a games CSV file: guesses are
+unchanged, and each status is joined into a single string (for example, 'NY?NN').
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import array
+import csv
+import json
+import sys
+from typing import Any, Optional, TextIO
+
+# The default buffer size (in bytes) of the files written by CsvSink and JsonlSink
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class GameRecord:
+    """A summary of one finished game of Adversarial Wordle.
+
+    Instance Attributes:
+        - winner: the player who won the game
+        - num_rounds: the number of guesses made in the game
+        - moves: the encoded move sequence of the game (see the module description), or None if it
+          was not recorded
+        - duration: the time taken to play the game, in seconds
+
+    Representation Invariants:
+        - self.winner in {'Guesser', 'Adversary'}
+        - self.num_rounds >= 1
+        - self.moves is None or len(self.moves) == 2 * self.num_rounds
+    """
+    __slots__ = ('winner', 'num_rounds', 'moves', 'duration')
+    winner: str
+    num_rounds: int
+    moves: Optional[tuple[str, ...]]
+    duration: float
+
+    def __init__(self, winner: str, num_rounds: int, moves: Optional[tuple[str, ...]], duration: float) -> None:
+        """Initialize a new game record with the given attributes."""
+        self.winner = winner
+        self.num_rounds = num_rounds
+        self.moves = moves
+        self.duration = duration
+
+    def get_move_sequence(self) -> list[str | tuple[str, ...]]:
+        """Return the move sequence of this game, in the same format as AdversarialWordle.get_move_sequence.
+
+        >>> record = GameRecord('Guesser', 1, ('hello', 'YYYYY'), 0.0)
+        >>> record.get_move_sequence()
+        ['hello', ('Y', 'Y', 'Y', 'Y', 'Y')]
+
+        Preconditions:
+            - self.moves is not None
+        """
+        return decode_move_sequence(self.moves)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a dictionary with the attributes of this record (which can be converted to JSON)."""
+        return {'winner': self.winner, 'num_rounds': self.num_rounds,
+                'moves': None if self.moves is None else list(self.moves), 'duration': self.duration}
+
+
+def encode_move_sequence(moves: list[str | tuple[str, ...]]) -> tuple[str, ...]:
+    """Return the given move sequence encoded as the cells of a row of a games CSV file.
+
+    >>> encode_move_sequence(['hello', ('N', '?', 'Y', 'N', 'N')])
+    ('hello', 'N?YNN')
+    """
+    return tuple(move if isinstance(move, str) else ''.join(move) for move in moves)
+
+
+def decode_move_sequence(cells: tuple[str, ...] | list[str]) -> list[str | tuple[str, ...]]:
+    """Return the move sequence encoded by the given cells of a row of a games CSV file.
+
+    Every second cell (starting from the second) is a status.
+    """
+    return [cell if i % 2 == 0 else tuple(cell) for i, cell in enumerate(cells)]
+
+
+################################################################################
+# Sinks
+################################################################################
+class GameRecordSink:
+    """An abstract class representing a destination for game records.
+
+    A sink can be used in a with statement, which closes it at the end.
+    """
+    def add(self, record: GameRecord) -> None:
+        """Add the record of the next game to this sink."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish adding records to this sink (for example, by flushing and closing a file)."""
+
+    def __enter__(self) -> GameRecordSink:
+        """Return this sink."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close this sink."""
+        self.close()
+
+
+class MemorySink(GameRecordSink):
+    """A sink that keeps the records it is given in arrays.
+
+    Instance Attributes:
+        - guesser_won: guesser_won[i] is 1 if the Guesser won game i, and 0 otherwise
+        - num_rounds: num_rounds[i] is the number of guesses made in game i
+        - durations: durations[i] is the time taken to play game i, in seconds
+        - moves: if move sequences are kept, moves[i] is the encoded move sequence of game i;
+          otherwise None
+
+    Representation Invariants:
+        - len(self.guesser_won) == len(self.num_rounds) == len(self.durations)
+        - self.moves is None or len(self.moves) == len(self.guesser_won)
+    """
+    guesser_won: array.array
+    num_rounds: array.array
+    durations: array.array
+    moves: Optional[list[tuple[str, ...]]]
+
+    def __init__(self, keep_moves: bool = False) -> None:
+        """Initialize a new empty sink, which keeps move sequences if keep_moves is True."""
+        self.guesser_won = array.array('b')
+        self.num_rounds = array.array('H')
+        self.durations = array.array('d')
+        self.moves = [] if keep_moves else None
+
+    def __len__(self) -> int:
+        """Return the number of records added to this sink."""
+        return len(self.guesser_won)
+
+    def add(self, record: GameRecord) -> None:
+        """Add the record of the next game to this sink.
+
+        Preconditions:
+            - self.moves is None or record.moves is not None
+        """
+        self.guesser_won.append(record.winner == 'Guesser')
+        self.num_rounds.append(record.num_rounds)
+        self.durations.append(record.duration)
+        if self.moves is not None:
+            self.moves.append(record.moves)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of games won by each player, in the same format as run_games."""
+        guesser_wins = sum(self.guesser_won)
+        return {'Guesser': guesser_wins, 'Adversary': len(self) - guesser_wins}
+
+    def winners(self) -> list[str]:
+        """Return the winner of each game, in the same format as the results of play_games."""
+        return ['Guesser' if won else 'Adversary' for won in self.guesser_won]
+
+    def get_record(self, i: int) -> GameRecord:
+        """Return the record of game i.
+
+        Preconditions:
+            - 0 <= i < len(self)
+        """
+        winner = 'Guesser' if self.guesser_won[i] else 'Adversary'
+        return GameRecord(winner, self.num_rounds[i], None if self.moves is None else self.moves[i],
+                          self.durations[i])
+
+
+class CsvSink(GameRecordSink):
+    """A sink that writes the move sequence of each game to a CSV file, one game per row.
+
+    The file has the same format as the files in data/games, so it can be read by
+    a2_part1.load_game_tree (or load_game_tree_bulk).
+    """
+    # Private Instance Attributes:
+    #   - _file: the file that the rows are written to
+    #   - _writer: a CSV writer for _file
+    _file: TextIO
+    _writer: Any
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Initialize a new sink that writes to the file at path (replacing its contents),
+        buffering up to buffer_size bytes at a time.
+        """
+        self._file = open(path, 'w', newline='', buffering=buffer_size)
+        self._writer = csv.writer(self._file, lineterminator='\n')
+
+    def add(self, record: GameRecord) -> None:
+        """Write the move sequence of the next game to this sink's file.
+
+        Preconditions:
+            - record.moves is not None
+        """
+        self._writer.writerow(record.moves)
+
+    def close(self) -> None:
+        """Flush and close this sink's file."""
+        self._file.close()
+
+
+class JsonlSink(GameRecordSink):
+    """A sink that writes each record to a file as one line of JSON (see GameRecord.to_dict)."""
+    # Private Instance Attributes:
+    #   - _file: the file that the records are written to
+    _file: TextIO
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Initialize a new sink that writes to the file at path (replacing its contents),
+        buffering up to buffer_size bytes at a time.
+        """
+        self._file = open(path, 'w', buffering=buffer_size)
+
+    def add(self, record: GameRecord) -> None:
+        """Write the next record to this sink's file."""
+        self._file.write(json.dumps(record.to_dict()))
+        self._file.write('\n')
+
+    def close(self) -> None:
+        """Flush and close this sink's file."""
+        self._file.close()
+
+
+class ProgressReporter(GameRecordSink):
+    """A sink that prints the record of every n-th game, together with the number of games won by each
+    player so far (unless n == 1, in which case every game is printed in the format run_games has always
+    used).
+
+    >>> reporter = ProgressReporter(2)
+    >>> for _ in range(0, 3):
+    ...     reporter.add(GameRecord('Guesser', 1, ('hello', 'YYYYY'), 0.0))
+    Game 1 winner: Guesser. Moves: ['hello', ('Y', 'Y', 'Y', 'Y', 'Y')] (Guesser: 2/2, Adversary: 0/2)
+    """
+    # Private Instance Attributes:
+    #   - _every: the number of games between printed games
+    #   - _stream: the stream that games are printed to
+    #   - _stats: the number of games won by each player so far
+    _every: int
+    _stream: Optional[TextIO]
+    _stats: dict[str, int]
+
+    def __init__(self, every: int = 1, stream: Optional[TextIO] = None) -> None:
+        """Initialize a new reporter that prints every n-th game to stream (by default, sys.stdout).
+
+        Preconditions:
+            - every >= 1
+        """
+        self._every = every
+        self._stream = stream
+        self._stats = {'Guesser': 0, 'Adversary': 0}
+
+    def add(self, record: GameRecord) -> None:
+        """Count the next game, and print it if it is an n-th game.
+
+        Preconditions:
+            - record.moves is not None
+        """
+        self._stats[record.winner] += 1
+        i = self._stats['Guesser'] + self._stats['Adversary'] - 1
+        if (i + 1) % self._every != 0:
+            return
+
+        line = f'Game {i} winner: {record.winner}. Moves: {record.get_move_sequence()}'
+        if self._every != 1:
+            line += f' (Guesser: {self._stats["Guesser"]}/{i + 1}, Adversary: {self._stats["Adversary"]}/{i + 1})'
+        print(line, file=self._stream if self._stream is not None else sys.stdout)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
@@ -18,9 +18,16 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
 """
 from __future__ import annotations
-from typing import Optional
+import array
+import io
+import math
+import random
+import sys
+from typing import Iterator, Optional, TextIO
 # from typing import Any
 
+import a2_moves
+
 # Comment out this line when you aren't using check_contracts
 # from python_ta.contracts import check_contracts
 
@@ -41,15 +48,18 @@ class GameTree:
 
     Instance Attributes:
         - move: the current move (guess or status), or '*' if this tree represents the start of a game
+        - move_code: the move code of self.move (see a2_moves)
         - guesser_win_probability: the probability that the Guesser will win from the current state of the game
 
     Representation Invariants:
         - self.move == GAME_START_MOVE or self.move is a valid Adversarial Wordle move
-        - all(key == self._subtrees[key].move for key in self._subtrees)
-        - GAME_START_MOVE not in self._subtrees  # since it can only appear at the very top of a game tree
+        - self.move_code == a2_moves.encode_move(self.move)
+        - all(key == self._subtrees[key].move_code for key in self._subtrees)
+        - a2_moves.GAME_START_CODE not in self._subtrees  # since it can only appear at the very top of a game tree
         - 0.0 <= guesser_win_probability <= 1.0
     """
     move: str | tuple[str, ...]  # The vertical bar | means "or"
+    move_code: int
     guesser_win_probability: float
 
     # Private Instance Attributes:
@@ -57,9 +67,26 @@ class GameTree:
     #      the subtrees of this tree, which represent the game trees after a possible
     #      move by the current player. Unlike the Tree representation in lecture,
     #      this collection is a MAPPING where the values are GameTrees, and associated
-    #      keys are the moves at the root of each subtree. See the last representation
-    #      invariant above.
-    _subtrees: dict[str | tuple[str, ...], GameTree]
+    #      keys are the move codes of the moves at the root of each subtree. See the
+    #      representation invariants above.
+    #  - _probability_sum:
+    #      the sum of the guesser win probabilities of the subtrees, which is kept up to date
+    #      as subtrees are added so that the average for an Adversary node takes O(1) time.
+    #      (For a Guesser node, guesser_win_probability itself is the running maximum.)
+    #  - _parent:
+    #      the tree that this tree was added to as a subtree, or None.
+    #      (A subtree shared by several trees, see a2_part2.TranspositionTable, only
+    #      records the first of them, which is why shared subtrees must not be mutated.)
+    #  - _size, _height, _num_leaves:
+    #      the number of nodes, the length of the longest path from the root to a leaf,
+    #      and the number of leaves of this tree. These are updated, for this tree and
+    #      its ancestors, whenever a subtree is added, so that __len__ and stats take O(1) time.
+    _subtrees: dict[int, GameTree]
+    _probability_sum: float
+    _parent: Optional[GameTree]
+    _size: int
+    _height: int
+    _num_leaves: int
 
     def __init__(self, move: str | tuple[str, ...] = GAME_START_MOVE, guesser_win_probability: float = 0.0) -> None:
         """Initialize a new game tree.
@@ -71,8 +98,54 @@ class GameTree:
         True
         """
         self.move = move
+        self.move_code = a2_moves.encode_move(move)
         self.guesser_win_probability = guesser_win_probability
         self._subtrees = {}
+        self._probability_sum = 0.0
+        self._parent = None
+        self._size = 1
+        self._height = 0
+        self._num_leaves = 1
+
+    @staticmethod
+    def from_move_code(move_code: int, guesser_win_probability: float = 0.0) -> GameTree:
+        """Return a new game tree whose root move has the given move code.
+
+        Preconditions:
+            - move_code was returned by a2_moves.encode_move in this process
+        """
+        tree = GameTree.__new__(GameTree)
+        tree.move = a2_moves.decode_move(move_code)
+        tree.move_code = move_code
+        tree.guesser_win_probability = guesser_win_probability
+        tree._subtrees = {}
+        tree._probability_sum = 0.0
+        tree._parent = None
+        tree._size = 1
+        tree._height = 0
+        tree._num_leaves = 1
+        return tree
+
+    def __getstate__(self) -> dict:
+        """Return the state of this tree for pickling.
+
+        Move codes are only meaningful in the process that created them, so the subtrees are pickled
+        as a list and re-keyed when they are unpickled. Parent links are restored from the subtrees.
+        """
+        state = dict(self.__dict__)
+        del state['move_code']
+        del state['_parent']
+        state['_subtrees'] = list(self._subtrees.values())
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state of this tree from pickling."""
+        self.__dict__.update(state)
+        self.move_code = a2_moves.encode_move(self.move)
+        self._subtrees = {subtree.move_code: subtree for subtree in state['_subtrees']}
+        self._parent = None
+        for subtree in self._subtrees.values():
+            subtree._parent = self
 
     def get_subtrees(self) -> list[GameTree]:
         """Return the subtrees of this game tree."""
@@ -83,23 +156,120 @@ class GameTree:
 
         Return None if no subtree corresponds to that move.
         """
-        if move in self._subtrees:
-            return self._subtrees[move]
-        else:
-            return None
+        return self.find_subtree_by_code(a2_moves.encode_move(move))
+
+    def find_subtree_by_code(self, move_code: int) -> Optional[GameTree]:
+        """Return the subtree whose move has the given move code (see a2_moves).
+
+        Return None if no subtree corresponds to that move.
+        """
+        return self._subtrees.get(move_code)
 
     def is_guesser_turn(self) -> bool:
         """Return whether the NEXT move should be made by the Guesser."""
-        return self.move == GAME_START_MOVE or isinstance(self.move, tuple)
+        # Only GAME_START_MOVE and statuses have negative move codes
+        return self.move_code < 0
 
     def __len__(self) -> int:
-        """Return the number of items in this tree."""
-        # Note: no "empty tree" base case is necessary here.
-        # Instead, the only implicit base case is when there are no subtrees (sum returns 0).
-        return 1 + sum(subtree.__len__() for subtree in self._subtrees.values())
+        """Return the number of items in this tree.
+
+        The size of every tree is cached, so this takes O(1) time.
+        """
+        return self._size
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of nodes, the depth and the number of leaves of this tree.
+
+        The depth is the number of moves on the longest path from the root to a leaf, so a tree with
+        a single node has depth 0. Like __len__, this takes O(1) time.
+
+        >>> tree = GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N'), 'words'])
+        >>> tree.insert_move_sequence(['world'])
+        >>> tree.stats()
+        {'nodes': 5, 'depth': 3, 'leaves': 2}
+        >>> other_tree = GameTree()
+        >>> other_tree.insert_move_sequence(['words', ('Y', 'N', 'N', 'N', 'N'), 'world', ('Y', 'Y', 'N', 'N', 'N')])
+        >>> tree.add_subtree(other_tree.find_subtree_by_move('words'))  # Subtrees can be grafted from other trees
+        >>> tree.stats(), other_tree.stats()
+        ({'nodes': 9, 'depth': 4, 'leaves': 3}, {'nodes': 5, 'depth': 4, 'leaves': 1})
+
+        The cached values agree with counting from scratch after random insertions and after subtrees
+        are replaced by smaller or larger ones (which can make the depth shrink):
+
+        >>> random.seed(111)
+        >>> tree = GameTree()
+        >>> checks = []
+        >>> for _ in range(0, 300):
+        ...     tree.insert_move_sequence(_random_move_sequence(8))
+        ...     moves = _random_move_sequence(5)
+        ...     graft_subtree = GameTree(moves[0])
+        ...     graft_subtree.insert_move_sequence(moves[1:])
+        ...     node = tree
+        ...     while node.get_subtrees() != [] and random.random() < 0.5:
+        ...         node = random.choice(node.get_subtrees())
+        ...     if node.is_guesser_turn():
+        ...         node.add_subtree(graft_subtree)
+        ...     checks.append(_matches_recomputation(tree))
+        >>> all(checks)
+        True
+        """
+        return {'nodes': self._size, 'depth': self._height, 'leaves': self._num_leaves}
+
+    ############################################################################
+    # Traversals (these use an explicit stack instead of recursion, so they work
+    # on trees of any depth)
+    ############################################################################
+    def iter_preorder(self) -> Iterator[tuple[GameTree, int]]:
+        """Return an iterator over (node, depth) pairs for the nodes of this tree in preorder.
+
+        The depth of this tree's root is 0, and subtrees are visited in the order they were added.
+
+        >>> tree = GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N')])
+        >>> tree.insert_move_sequence(['words'])
+        >>> [(node.move, depth) for node, depth in tree.iter_preorder()]
+        [('*', 0), ('hello', 1), (('N', 'N', 'N', 'N', 'N'), 2), ('words', 1)]
+        """
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            stack.extend((subtree, depth + 1) for subtree in reversed(node._subtrees.values()))
+
+    def iter_postorder(self) -> Iterator[GameTree]:
+        """Return an iterator over the nodes of this tree in postorder (every node after its subtrees).
+
+        >>> tree = GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N')])
+        >>> tree.insert_move_sequence(['words'])
+        >>> [node.move for node in tree.iter_postorder()]
+        [('N', 'N', 'N', 'N', 'N'), 'hello', 'words', '*']
+        """
+        # Each stack entry is a node and an iterator over the subtrees of that node still to visit
+        stack = [(self, iter(self._subtrees.values()))]
+        while stack:
+            node, subtrees = stack[-1]
+            subtree = next(subtrees, None)
+            if subtree is None:
+                stack.pop()
+                yield node
+            else:
+                stack.append((subtree, iter(subtree._subtrees.values())))
+
+    def evaluate_guesser_win_probabilities(self) -> None:
+        """Recalculate the guesser win probability of every node in this tree, from the leaves up.
+
+        Leaves keep their current guesser win probabilities (see _update_guesser_win_probability).
+        """
+        for node in self.iter_postorder():
+            node._update_guesser_win_probability()
 
     def __str__(self) -> str:
         """Return a string representation of this tree.
+
+        For large trees, use render instead, which writes the lines one at a time and can limit how
+        much of the tree is shown.
         """
         return self._str_indented(0)
 
@@ -114,20 +284,205 @@ class GameTree:
         Preconditions:
             - depth >= 0
         """
+        output = io.StringIO()
+        self.render(output, indent=depth)
+        return output.getvalue()
+
+    def render(self, stream: Optional[TextIO] = None, max_depth: Optional[int] = None,
+               max_children: Optional[int] = None, show_probabilities: bool = False, indent: int = 0) -> None:
+        """Write an indented representation of this tree to stream (by default, sys.stdout), one line per node.
+
+        Subtrees more than max_depth moves below the root, and all but the first max_children subtrees
+        of each node, are replaced by a single "... N more" line. If show_probabilities is True, each line
+        also shows the node's guesser win probability. indent is the indentation level of the root.
+
+        The lines are written as the tree is traversed, so the memory used does not depend on the size
+        of the tree.
+
+        Preconditions:
+            - max_depth is None or max_depth >= 0
+            - max_children is None or max_children >= 0
+            - indent >= 0
+
+        >>> tree = GameTree()
+        >>> for guess in ['hello', 'words', 'world', 'reach']:
+        ...     tree.insert_move_sequence([guess, ('N', 'N', 'N', 'N', 'N')], 0.5)
+        >>> tree.render(max_depth=1, max_children=2, show_probabilities=True)
+        * -> Guesser's move (0.500)
+          hello -> Adversary's move (0.500)
+            ... 1 more
+          words -> Adversary's move (0.500)
+            ... 1 more
+          ... 2 more
+        """
+        if stream is None:
+            stream = sys.stdout
+        for line in self._iter_lines(max_depth, max_children, show_probabilities, indent):
+            stream.write(line)
+
+    def _iter_lines(self, max_depth: Optional[int], max_children: Optional[int], show_probabilities: bool,
+                    indent: int) -> Iterator[str]:
+        """Return an iterator over the lines written by render, with the same arguments."""
+        yield self._line(indent, show_probabilities)
+        if max_depth == 0:
+            if self._subtrees:
+                yield '  ' * (indent + 1) + f'... {len(self._subtrees)} more\n'
+            return
+
+        # Each stack entry is [an iterator over the subtrees of a node, its number of subtrees,
+        # the number of those subtrees shown so far]. The subtrees of the top entry are at depth len(stack).
+        stack = [[iter(self._subtrees.values()), len(self._subtrees), 0]]
+        while stack:
+            entry = stack[-1]
+            subtrees, num_subtrees, num_shown = entry
+            depth = len(stack)
+            if num_shown == max_children:
+                stack.pop()
+                if num_shown < num_subtrees:
+                    yield '  ' * (indent + depth) + f'... {num_subtrees - num_shown} more\n'
+                continue
+
+            subtree = next(subtrees, None)
+            if subtree is None:
+                stack.pop()
+                continue
+            entry[2] += 1
+
+            yield subtree._line(indent + depth, show_probabilities)
+            if subtree._subtrees:
+                if depth == max_depth:
+                    yield '  ' * (indent + depth + 1) + f'... {len(subtree._subtrees)} more\n'
+                else:
+                    stack.append([iter(subtree._subtrees.values()), len(subtree._subtrees), 0])
+
+    def _line(self, indent: int, show_probability: bool) -> str:
+        """Return the line that represents the root of this tree in render."""
         if self.is_guesser_turn():
             turn_desc = "Guesser's move"
         else:
             turn_desc = "Adversary's move"
-        move_desc = f'{self.move} -> {turn_desc}\n'
-        str_so_far = '  ' * depth + move_desc
-        for subtree in self._subtrees.values():
-            str_so_far += subtree._str_indented(depth + 1)
-        return str_so_far
+        if show_probability:
+            return '  ' * indent + f'{self.move} -> {turn_desc} ({self.guesser_win_probability:.3f})\n'
+        return '  ' * indent + f'{self.move} -> {turn_desc}\n'
 
-    def add_subtree(self, subtree: GameTree) -> None:
-        """Add a subtree to this game tree."""
-        self._subtrees[subtree.move] = subtree
-        self._update_guesser_win_probability()
+    def add_subtree(self, subtree: GameTree, shared: bool = False) -> None:
+        """Add a subtree to this game tree.
+
+        If subtree already belongs to another tree, a copy of it is added instead (unless shared is
+        True), as described in attach_subtree.
+
+        The guesser win probability of this tree is updated from its running aggregates, which takes
+        O(1) time except when subtree replaces the most likely subtree of a Guesser node.
+        """
+        old_subtree = self.attach_subtree(subtree, shared)
+        if old_subtree is None:
+            self._probability_sum += subtree.guesser_win_probability
+            self._update_for_subtree(None, subtree.guesser_win_probability)
+        else:
+            self._update_for_subtree(old_subtree.guesser_win_probability, subtree.guesser_win_probability)
+
+    def attach_subtree(self, subtree: GameTree, shared: bool = False) -> Optional[GameTree]:
+        """Add a subtree to this game tree without changing any guesser win probabilities, and return
+        the subtree it replaces (or None).
+
+        This is meant for building many nodes at once: the caller is responsible for the guesser win
+        probabilities, for example by calling evaluate_guesser_win_probabilities when the tree is built.
+        Use add_subtree to keep them up to date instead.
+
+        The cached sizes, heights and numbers of leaves of this tree and its ancestors are updated,
+        walking up the parent links until nothing changes. Since only one tree can be updated this way,
+        a subtree that already belongs to another tree is copied (see encode_game_tree), and the copy is
+        added instead, so that later changes to either tree do not affect the other. If shared is True,
+        subtree itself is added and shared by both trees (see a2_part2.TranspositionTable); a shared
+        subtree must not be mutated afterwards, since only the tree it was first added to is updated.
+
+        >>> tree = GameTree()
+        >>> leaf = GameTree('hello', 1.0)
+        >>> tree.attach_subtree(leaf) is None
+        True
+        >>> len(tree), tree.guesser_win_probability
+        (2, 0.0)
+        >>> tree.evaluate_guesser_win_probabilities()
+        >>> tree.guesser_win_probability
+        1.0
+
+        Grafting a subtree of another tree leaves both trees correct, including after later insertions
+        into either of them:
+
+        >>> source = GameTree()
+        >>> source.insert_move_sequence(['words', ('Y', 'N', 'N', 'N', 'N'), 'world'])
+        >>> target = GameTree()
+        >>> target.attach_subtree(source.find_subtree_by_move('words')) is None
+        True
+        >>> target.insert_move_sequence(['words', ('Y', 'N', 'N', 'N', 'N'), 'wordy', ('Y', 'Y', 'N', 'N', 'N')])
+        >>> source.insert_move_sequence(['words', ('N', 'N', 'N', 'N', 'N')])
+        >>> len(source), len(target)
+        (5, 6)
+        >>> _matches_recomputation(source), _matches_recomputation(target)
+        (True, True)
+
+        """
+        if subtree._parent is not None and subtree._parent is not self and not shared:
+            subtree = decode_game_tree(encode_game_tree(subtree))
+        if subtree._parent is None:
+            subtree._parent = self
+
+        old_subtree = self._subtrees.get(subtree.move_code)
+        self._subtrees[subtree.move_code] = subtree
+
+        if old_subtree is None:
+            size_change = subtree._size
+            leaves_change = subtree._num_leaves - (1 if len(self._subtrees) == 1 else 0)
+            old_height = -1
+        else:
+            size_change = subtree._size - old_subtree._size
+            leaves_change = subtree._num_leaves - old_subtree._num_leaves
+            old_height = old_subtree._height
+        new_height = subtree._height
+
+        node = self
+        while node is not None:
+            node_old_height = node._height
+            node._size += size_change
+            node._num_leaves += leaves_change
+            if new_height + 1 > node._height:
+                node._height = new_height + 1
+            elif old_height + 1 == node._height and new_height < old_height:
+                # The tallest subtree became shorter, so the height has to be found again
+                node._height = max(child._height for child in node._subtrees.values()) + 1
+
+            if size_change == 0 and leaves_change == 0 and node._height == node_old_height:
+                break
+            old_height, new_height = node_old_height, node._height
+            node = node._parent
+
+        return old_subtree
+
+    def _update_for_subtree(self, old_probability: Optional[float], new_probability: float) -> None:
+        """Update the guesser win probability of this tree after one of its subtrees changed its guesser
+        win probability from old_probability to new_probability.
+
+        old_probability is None if the subtree was just added (in which case it has already been
+        added to self._probability_sum).
+
+        Preconditions:
+            - self._subtrees != {}
+        """
+        if old_probability is not None:
+            self._probability_sum += new_probability - old_probability
+
+        num_subtrees = len(self._subtrees)
+        if num_subtrees == 1:
+            self._probability_sum = new_probability
+            self.guesser_win_probability = new_probability
+        elif not self.is_guesser_turn():
+            # Clamp, since adding and subtracting probabilities can leave a tiny rounding error
+            self.guesser_win_probability = min(1.0, max(0.0, self._probability_sum / num_subtrees))
+        elif new_probability >= self.guesser_win_probability:
+            self.guesser_win_probability = new_probability
+        elif old_probability is not None and old_probability >= self.guesser_win_probability:
+            # The most likely subtree became less likely, so the maximum has to be found again
+            self.guesser_win_probability = max(subtree.guesser_win_probability for subtree in self._subtrees.values())
 
     ############################################################################
     # Part 1: Loading and "Replaying" Adversarial Wordle games
@@ -155,18 +510,14 @@ class GameTree:
         then moves == [] or isinstance(moves[0], tuple)
 
 
+        Every new node is given the guesser win probability guesser_win_probability, and the guesser
+        win probabilities of the existing nodes on the path are then updated from the bottom up (see
+        _update_guesser_win_probability), so the whole path is consistent after the insertion.
+
         Implementation Notes:
-            - Your implementation must use recursion, and NOT use any loops to "go down" the tree.
-                - "Using recursion" also includes calling a recursive helper method, like GameTree__str__.
-            - Your implementation must have a worst-case running time of Theta(m) time, where m is
-              the length of moves. This means you shouldn't use list slicing to access the "rest" of
-              the list of moves, like in Tutorial 4. Instead, you can use one of the following approaches:
-
-              i) Use a recursive helper method that takes an extra "current index" argument to
-                 keep track of the next move in the list to add.
-              ii) First reverse the list, and then use a recursive helper method that calls
-                 `list.pop` on the list of moves. Just make sure the original list isn't changed
-                 when the function ends!
+            - This method walks down the tree with a loop rather than recursion, so there is no limit
+              on the length of moves. It runs in O(m) time, where m is the length of moves, except
+              when the maximum of a Guesser node on the path decreases and has to be found again.
 
         >>> game_tree = GameTree(GAME_START_MOVE)
         >>> sub1 = GameTree('reach')
@@ -182,26 +533,90 @@ class GameTree:
             ('?', 'N', 'Y', 'N', 'N') -> Guesser's move
                 brawl -> Adversary's move
                 quart -> Adversary's move
+        >>> tree = GameTree()
+        >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N')], 1.0)
+        >>> tree.insert_move_sequence(['hello', ('Y', 'N', 'N', 'N', 'N')], 0.0)
+        >>> tree.guesser_win_probability, tree.find_subtree_by_move('hello').guesser_win_probability
+        (0.5, 0.5)
+
+        The probabilities updated along the path agree with recomputing the whole tree from scratch:
+
+        >>> random.seed(111)
+        >>> tree = GameTree()
+        >>> checks = []
+        >>> for _ in range(0, 300):
+        ...     tree.insert_move_sequence(_random_move_sequence(6), random.choice([0.0, 0.25, 1.0]))
+        ...     checks.append(_matches_recomputation(tree))
+        >>> all(checks), len(tree) > 100
+        (True, True)
         """
-        self._check_tree(moves, 0, guesser_win_probability)
-
-    def _check_tree(self, given_moves: list[str | tuple[str, ...]], curr_index: int,
-                    guesser_win_probability: float) -> None:
-        """Check whether the subtrees contain the item in moves.
-        If the item is not in the subtrees, add a new subtree containing the item.
-        If the item is in the subtrees, recurse into the subtree containing the item.
+        # Walk down the existing part of the path, remembering each node's current probability
+        path = [(self, self.guesser_win_probability)]
+        i = 0
+        while i < len(moves):
+            subtree = path[-1][0]._subtrees.get(a2_moves.encode_move(moves[i]))
+            if subtree is None:
+                break
+            path.append((subtree, subtree.guesser_win_probability))
+            i += 1
+
+        if i == len(moves):
+            return
+
+        # Build the new part of the path, in which every node has the given probability
+        new_nodes = [GameTree(move, guesser_win_probability) for move in moves[i:]]
+        for parent, child in zip(new_nodes, new_nodes[1:]):
+            parent.add_subtree(child)
+        path[-1][0].add_subtree(new_nodes[0])
+
+        # Propagate the change up the existing part of the path, stopping once a probability is unchanged
+        for j in range(len(path) - 1, 0, -1):
+            node, old_probability = path[j]
+            if node.guesser_win_probability == old_probability:
+                break
+            path[j - 1][0]._update_for_subtree(old_probability, node.guesser_win_probability)
+
+    def merge(self, other: GameTree) -> None:
+        """Add every move sequence of other to this tree.
+
+        This is the same as merge_game_trees([self, other]); see that function for details.
+
+        >>> tree1 = GameTree()
+        >>> tree1.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N')], 1.0)
+        >>> tree2 = GameTree()
+        >>> tree2.insert_move_sequence(['hello', ('Y', 'N', 'N', 'N', 'N')], 0.0)
+        >>> tree2.insert_move_sequence(['words'], 0.25)
+        >>> tree1.merge(tree2)
+        >>> print(tree1)
+        * -> Guesser's move
+          hello -> Adversary's move
+            ('N', 'N', 'N', 'N', 'N') -> Guesser's move
+            ('Y', 'N', 'N', 'N', 'N') -> Guesser's move
+          words -> Adversary's move
+        <BLANKLINE>
+        >>> tree1.find_subtree_by_move('hello').guesser_win_probability, tree1.guesser_win_probability
+        (0.5, 0.5)
+
+        Merging random trees gives exactly the union of their move sequences, and every node's cached
+        values agree with recomputing them from scratch:
+
+        >>> def paths(tree: GameTree) -> set:
+        ...     return {(tree.move,)} | {(tree.move,) + path for subtree in tree.get_subtrees()
+        ...                              for path in paths(subtree)}
+        >>> random.seed(111)
+        >>> checks = []
+        >>> for _ in range(0, 50):
+        ...     tree1, tree2 = GameTree(), GameTree()
+        ...     for i in range(0, 20):
+        ...         (tree1 if i % 2 == 0 else tree2).insert_move_sequence(_random_move_sequence(8),
+        ...                                                               random.choice([0.0, 0.25, 1.0]))
+        ...     expected_paths = paths(tree1) | paths(tree2)
+        ...     tree1.merge(tree2)
+        ...     checks.append(paths(tree1) == expected_paths and _matches_recomputation(tree1))
+        >>> all(checks)
+        True
         """
-        if curr_index <= len(given_moves) - 1:
-            item = given_moves[curr_index]
-
-            if item not in self._subtrees:
-                subtree = GameTree(item)
-                self.add_subtree(subtree)
-                subtree.guesser_win_probability = guesser_win_probability
-                # self.add_subtree(GameTree(item))
-                # self.find_subtree_by_move(item).guesser_win_probability = guesser_win_probability
-
-            self._subtrees[item]._check_tree(given_moves, curr_index + 1, guesser_win_probability)
+        merge_game_trees([self, other])
 
     ############################################################################
     # Part 2: Complete Game Trees and Win Probabilities
@@ -222,6 +637,7 @@ class GameTree:
               is equal to the AVERAGE of the guesser win probabilities of its subtrees
         """
         subtree_win_probs = [subtree.guesser_win_probability for subtree in self.get_subtrees()]
+        self._probability_sum = sum(subtree_win_probs)
 
         if self._subtrees == {}:
             pass
@@ -231,6 +647,195 @@ class GameTree:
             self.guesser_win_probability = sum(subtree_win_probs) / len(subtree_win_probs)
 
 
+################################################################################
+# Merging
+################################################################################
+def merge_game_trees(trees: list[GameTree]) -> GameTree:
+    """Add every move sequence of trees[1:] to trees[0], and return trees[0].
+
+    The trees are merged in a single pass over the nodes they have in common. A subtree that only
+    one of the trees has is moved into the result rather than copied, so trees[1:] must not be used
+    (or mutated) afterwards. Guesser win probabilities are combined as follows:
+        - a node that is a leaf in every tree it appears in gets the average of its guesser win
+          probabilities in those trees, and
+        - every other node that appears in more than one tree is recalculated from its subtrees
+          (see _update_guesser_win_probability), from the leaves up.
+    Subtrees that only appear in one tree keep their guesser win probabilities.
+
+    Preconditions:
+        - trees != []
+        - all(tree.move == trees[0].move for tree in trees)
+        - no tree is a LazyGameTree, and no two trees share a subtree
+    """
+    # Each stack entry is (node, others, merged), where others are the nodes at the same position in
+    # the other trees. If merged is True, the subtrees of others have already been merged into node.
+    stack = [(trees[0], trees[1:], False)]
+    while stack:
+        node, others, merged = stack.pop()
+        if merged:
+            if node._subtrees:
+                node._update_guesser_win_probability()
+            elif others:
+                total = node.guesser_win_probability + sum(other.guesser_win_probability for other in others)
+                node.guesser_win_probability = total / (len(others) + 1)
+            continue
+
+        stack.append((node, others, True))
+        # The subtrees of others that have to be merged into each subtree of node, keyed by move code
+        groups = {}
+        for other in others:
+            for other_subtree in other._subtrees.values():
+                subtree = node._subtrees.get(other_subtree.move_code)
+                if subtree is None:
+                    other_subtree._parent = None  # other is not used afterwards, so the subtree is moved
+                    node.attach_subtree(other_subtree)
+                else:
+                    groups.setdefault(other_subtree.move_code, (subtree, []))[1].append(other_subtree)
+        for subtree, other_subtrees in groups.values():
+            stack.append((subtree, other_subtrees, False))
+
+    return trees[0]
+
+
+################################################################################
+# Compact encoding (used to send game trees between processes)
+################################################################################
+def encode_game_tree(tree: GameTree) -> tuple[list[str | tuple[str, ...]], array.array, array.array, array.array]:
+    """Return a compact encoding of the given game tree.
+
+    The encoding is a tuple (moves, probabilities, num_children, child_ids). The nodes of the tree are
+    numbered in breadth-first order starting from 0 at the root, and node i has move moves[i], guesser
+    win probability probabilities[i], and num_children[i] children, whose node numbers are the next
+    num_children[i] entries of child_ids. A GameTree object that appears in several places in the tree
+    (see a2_part2.TranspositionTable) is encoded only once.
+
+    >>> tree = GameTree()
+    >>> tree.insert_move_sequence(['hello', ('N', 'N', 'N', 'N', 'N'), 'words'])
+    >>> moves, probabilities, num_children, child_ids = encode_game_tree(tree)
+    >>> moves
+    ['*', 'hello', ('N', 'N', 'N', 'N', 'N'), 'words']
+    >>> list(num_children), list(child_ids)
+    ([1, 1, 1, 0], [1, 2, 3])
+    """
+    node_numbers = {id(tree): 0}
+    nodes = [tree]
+    num_children = array.array('I')
+    child_ids = array.array('I')
+
+    for node in nodes:  # nodes grows as new subtrees are found
+        num_children.append(len(node._subtrees))
+        for subtree in node._subtrees.values():
+            if id(subtree) not in node_numbers:
+                node_numbers[id(subtree)] = len(nodes)
+                nodes.append(subtree)
+            child_ids.append(node_numbers[id(subtree)])
+
+    moves = [node.move for node in nodes]
+    probabilities = array.array('d', [node.guesser_win_probability for node in nodes])
+    return moves, probabilities, num_children, child_ids
+
+
+def decode_game_tree(encoding: tuple[list[str | tuple[str, ...]], array.array, array.array, array.array]) \
+        -> GameTree:
+    """Return the game tree with the given encoding.
+
+    Preconditions:
+        - encoding was returned by encode_game_tree
+    """
+    moves, probabilities, num_children, child_ids = encoding
+    nodes = [GameTree(move, probability) for move, probability in zip(moves, probabilities)]
+
+    next_child = 0
+    for node, count in zip(nodes, num_children):
+        for child_id in child_ids[next_child:next_child + count]:
+            subtree = nodes[child_id]
+            node._subtrees[subtree.move_code] = subtree
+            node._probability_sum += subtree.guesser_win_probability
+            subtree._parent = node
+        next_child += count
+
+    _refresh_shapes(nodes[0])
+    return nodes[0]
+
+
+def _refresh_shapes(tree: GameTree) -> None:
+    """Recalculate the cached size, height and number of leaves of every node of tree, from the leaves up.
+
+    A subtree that appears in several places in tree is only recalculated once.
+    """
+    visited = set()
+    # Each stack entry is a node and whether its subtrees have already been recalculated
+    stack = [(tree, False)]
+    while stack:
+        node, subtrees_done = stack.pop()
+        if subtrees_done:
+            subtrees = node._subtrees.values()
+            if subtrees:
+                node._size = 1 + sum(subtree._size for subtree in subtrees)
+                node._height = 1 + max(subtree._height for subtree in subtrees)
+                node._num_leaves = sum(subtree._num_leaves for subtree in subtrees)
+            else:
+                node._size, node._height, node._num_leaves = 1, 0, 1
+        elif id(node) not in visited:
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((subtree, False) for subtree in node._subtrees.values() if id(subtree) not in visited)
+
+
+################################################################################
+# Checking cached values
+################################################################################
+def _matches_recomputation(tree: GameTree) -> bool:
+    """Return whether the guesser win probability and the cached size, height and number of leaves of every
+    node of tree are equal to the values computed recursively from scratch (see
+    _update_guesser_win_probability), using the guesser win probabilities of the leaves as they are.
+
+    Probabilities are compared with a tolerance, since the running aggregates add and subtract them.
+    This is the straightforward computation that the cached values replace, and is only used to check them.
+
+    Preconditions:
+        - no two nodes of tree share a subtree
+    """
+    return _recompute(tree) is not None
+
+
+def _recompute(tree: GameTree) -> Optional[tuple[float, int, int, int]]:
+    """Return the guesser win probability, size, height and number of leaves of tree computed recursively
+    from scratch, or None if the cached values of any node of tree do not match.
+    """
+    if not tree._subtrees:
+        values = (tree.guesser_win_probability, 1, 0, 1)
+    else:
+        results = [_recompute(subtree) for subtree in tree._subtrees.values()]
+        if None in results:
+            return None
+        probabilities = [result[0] for result in results]
+        if tree.is_guesser_turn():
+            probability = max(probabilities)
+        else:
+            probability = sum(probabilities) / len(probabilities)
+        values = (probability, 1 + sum(result[1] for result in results), 1 + max(result[2] for result in results),
+                  sum(result[3] for result in results))
+
+    if not math.isclose(tree.guesser_win_probability, values[0], abs_tol=1e-9) \
+            or (tree._size, tree._height, tree._num_leaves) != values[1:]:
+        return None
+    return values
+
+
+def _random_move_sequence(max_length: int) -> list[str | tuple[str, ...]]:
+    """Return a random sequence of between 1 and max_length moves, drawn from a few guesses and statuses so
+    that random sequences often share prefixes. Used to check the cached values of trees.
+
+    Preconditions:
+        - max_length >= 1
+    """
+    guesses = ['hello', 'words', 'world']
+    statuses = [('N', 'N', 'N', 'N', 'N'), ('Y', 'N', 'N', 'N', 'N'), ('?', 'N', 'Y', 'N', 'N')]
+    return [random.choice(guesses) if i % 2 == 0 else random.choice(statuses)
+            for i in range(0, random.randint(1, max_length))]
+
+
 if __name__ == '__main__':
     import doctest
 
@@ -0,0 +1,106 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Import Times)
+
+Module Description
+==================
+
+This module contains a benchmark of how long it takes to import the modules of this assignment, which
+is paid by every script, test run and worker process (see a2_adversarial_wordle.play_games) that uses
+them. Each module is imported in a fresh Python process run with "python -X importtime", which reports
+the time taken to import every module, and the cumulative time of the module itself is recorded.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import os
+import subprocess
+import sys
+from typing import Any
+
+# The modules measured by import_time_report by default
+DEFAULT_MODULES = ('a2_adversarial_wordle', 'a2_game_tree', 'a2_part1', 'a2_part2', 'a2_part3')
+
+# Modules that are slow to import, and should only be imported when they are used
+HEAVY_MODULES = ('plotly', 'python_ta')
+
+
+def measure_import_time(module_name: str, repeat: int = 3) -> dict[str, Any]:
+    """Import the module with the given name in repeat fresh Python processes, and return:
+
+        - 'seconds': the smallest cumulative time taken to import the module (in seconds),
+        - 'heaviest': the (name, seconds) pairs of the five imported modules that took the most time
+          to import themselves (excluding the modules they imported), in the fastest process, and
+        - 'heavy_modules': the modules in HEAVY_MODULES that were imported.
+
+    The module is imported from the directory that contains this file.
+
+    Preconditions:
+        - module_name is the name of a module in the same directory as this file
+        - repeat >= 1
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(0, repeat):
+        times = _import_times(module_name, directory)
+        if best is None or times[module_name][1] < best[module_name][1]:
+            best = times
+
+    heaviest = sorted(((name, self_seconds) for name, (self_seconds, _) in best.items()),
+                      key=lambda pair: pair[1], reverse=True)[:5]
+    heavy_modules = sorted({name.split('.')[0] for name in best} & set(HEAVY_MODULES))
+    return {'seconds': best[module_name][1], 'heaviest': heaviest, 'heavy_modules': heavy_modules}
+
+
+def import_time_report(module_names: tuple[str, ...] = DEFAULT_MODULES, repeat: int = 3) -> dict[str, dict]:
+    """Return the results of measure_import_time for each of the given modules, keyed by module name.
+
+    Preconditions:
+        - every name in module_names is the name of a module in the same directory as this file
+        - repeat >= 1
+    """
+    return {module_name: measure_import_time(module_name, repeat) for module_name in module_names}
+
+
+def _import_times(module_name: str, directory: str) -> dict[str, tuple[float, float]]:
+    """Import the module with the given name in a fresh Python process run with -X importtime, and
+    return the time (in seconds) taken to import it and each module it imported, both by itself and
+    cumulatively, keyed by module name.
+
+    Modules imported by Python itself at startup (before module_name) are not included.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                             cwd=directory, capture_output=True, text=True, check=True)
+
+    # Each line of the report looks like "import time:       123 |        456 |   package.module",
+    # where the times are in microseconds. Every module is reported after the modules it imported,
+    # and its name is indented less than theirs.
+    entries = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        indent = len(name) - len(name.lstrip())
+        entries.append((name.strip(), indent, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+
+    end = max(i for i, entry in enumerate(entries) if entry[0] == module_name)
+    start = end
+    while start > 0 and entries[start - 1][1] > entries[end][1]:
+        start -= 1
+
+    return {name: (self_seconds, cumulative_seconds)
+            for name, _, self_seconds, cumulative_seconds in entries[start:end + 1]}
+
+
+if __name__ == '__main__':
+    for module, result in import_time_report().items():
+        print(f'{module}: {result["seconds"] * 1000:.1f} ms, heavy modules: {result["heavy_modules"]}')
+        for heavy_name, seconds in result['heaviest']:
+            print(f'    {heavy_name}: {seconds * 1000:.1f} ms')
@@ -0,0 +1,389 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Monte Carlo Tree Search)
+
+Module Description
+==================
+
+This module contains MCTSGuesser, a Guesser player that chooses each guess with Monte Carlo tree search
+(using the UCT rule to balance trying promising guesses and exploring new ones). Unlike GreedyTreeGuesser
+and ExploringGuesser, it does not need a game tree that was generated or learned ahead of time, so it can
+play with any word set, including the full official_wordle.txt.
+
+Before each guess, the player runs a number of *playouts* (or as many as fit in a time budget). Each
+playout follows the search tree from the current game state, choosing guesses with UCT and statuses at
+random as a RandomAdversary would, until it reaches a state that is not in the tree yet; it adds that
+state to the tree, finishes the game with random moves (a *rollout*), and records the result in every
+node it passed through. The player then makes the guess that was tried the most.
+
+The search tree is a SearchTree, a GameTree whose nodes also store their game state (as word ids in the
+word set's feedback matrix) and their playout statistics; the guesser win probability of each node is
+the fraction of its playouts that the Guesser won. After the Adversary returns a status, the subtree for
+that status becomes the new root, so the playouts already made below it are kept for the next guess.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import math
+import random
+import time
+from typing import Optional
+
+import a2_adversarial_wordle as aw
+import a2_feedback
+import a2_game_tree
+import a2_moves
+
+# The default exploration constant of the UCT rule
+DEFAULT_EXPLORATION = math.sqrt(2)
+
+
+class SearchTree(a2_game_tree.GameTree):
+    """A node of the search tree of an MCTSGuesser.
+
+    The guesser win probability of a node is the fraction of the playouts through it that the Guesser won.
+
+    Instance Attributes:
+        - answer_ids: the ids of the possible answers in this node's game state (on the Adversary's turn,
+          before the Adversary returns a status)
+        - guesses_remaining: the number of guesses the Guesser has left after this node's move
+        - winner: the winner of the game after this node's move, or None if the game is not over
+        - visits: the number of playouts through this node
+        - wins: the number of playouts through this node that the Guesser won
+
+    Representation Invariants:
+        - self.answer_ids != ()
+        - 0 <= self.wins <= self.visits
+        - all(isinstance(subtree, SearchTree) for subtree in self._subtrees.values())
+    """
+    answer_ids: tuple[int, ...]
+    guesses_remaining: int
+    winner: Optional[str]
+    visits: int
+    wins: int
+
+    # Private Instance Attributes:
+    #   - _untried: on the Guesser's turn, the ids of the guesses that have no subtree yet (in the random
+    #               order they will be tried in); otherwise, []
+    _untried: list[int]
+
+    def __init__(self, move: str | tuple[str, ...], answer_ids: tuple[int, ...], guesses_remaining: int,
+                 winner: Optional[str] = None) -> None:
+        """Initialize a new search tree node with no playouts."""
+        super().__init__(move)
+        self.answer_ids = answer_ids
+        self.guesses_remaining = guesses_remaining
+        self.winner = winner
+        self.visits = 0
+        self.wins = 0
+        if self.is_guesser_turn() and winner is None:
+            self._untried = random.sample(answer_ids, len(answer_ids))
+        else:
+            self._untried = []
+
+    def get_search_subtrees(self) -> list[SearchTree]:
+        """Return the subtrees of this search tree, typed as search trees."""
+        return [subtree for subtree in self._subtrees.values() if isinstance(subtree, SearchTree)]
+
+    def find_subtree_by_code(self, move_code: int) -> Optional[SearchTree]:
+        """Return the subtree whose move has the given move code (see a2_moves).
+
+        Return None if no subtree corresponds to that move.
+        """
+        subtree = self._subtrees.get(move_code)
+        return subtree if isinstance(subtree, SearchTree) else None
+
+    def guess(self) -> str:
+        """Return the guess made by this node's move.
+
+        Preconditions:
+            - not self.is_guesser_turn()
+        """
+        assert isinstance(self.move, str)
+        return self.move
+
+    def make_root(self) -> None:
+        """Detach this node from its parent, so that the rest of the search tree can be freed."""
+        self._parent = None
+
+    def record_playout(self, guesser_won: bool) -> None:
+        """Record a playout through this node, and update its guesser win probability."""
+        self.visits += 1
+        self.wins += guesser_won
+        self.guesser_win_probability = self.wins / self.visits
+
+    def has_untried_guess(self) -> bool:
+        """Return whether this node has a guess that has not been added to the tree yet."""
+        return self._untried != []
+
+    def pop_untried_guess(self) -> int:
+        """Remove and return the id of a guess that has not been added to the tree yet.
+
+        Preconditions:
+            - self.has_untried_guess()
+        """
+        return self._untried.pop()
+
+    def best_subtree(self, exploration: float) -> SearchTree:
+        """Return the subtree with the highest UCT score: its guesser win probability, plus an exploration
+        bonus that is larger for subtrees with fewer playouts (relative to this node).
+
+        Preconditions:
+            - self._subtrees != {}
+        """
+        log_visits = math.log(self.visits)
+
+        def score(subtree: SearchTree) -> float:
+            """Return the UCT score of subtree."""
+            return subtree.wins / subtree.visits + exploration * math.sqrt(log_visits / subtree.visits)
+
+        return max(self.get_search_subtrees(), key=score)
+
+    def most_visited_subtree(self) -> SearchTree:
+        """Return the subtree with the most playouts.
+
+        Preconditions:
+            - self._subtrees != {}
+        """
+        return max(self.get_search_subtrees(), key=lambda subtree: subtree.visits)
+
+
+class MCTSGuesser(aw.Guesser):
+    """A Guesser player that chooses its guesses with Monte Carlo tree search.
+
+    Each guess is chosen after num_playouts playouts, or (if time_limit is not None) after as many
+    playouts as fit in time_limit seconds (and at least one).
+
+    Instance Attributes:
+        - num_playouts: the number of playouts run before each guess, if time_limit is None
+        - time_limit: the time (in seconds) spent on playouts before each guess, or None
+        - exploration: the exploration constant of the UCT rule
+        - last_playouts: the number of playouts run before the most recent guess
+
+    Representation Invariants:
+        - self.num_playouts >= 1
+        - self.time_limit is None or self.time_limit > 0
+    """
+    num_playouts: int
+    time_limit: Optional[float]
+    exploration: float
+    last_playouts: int
+
+    # Private Instance Attributes:
+    #   - _feedback: the feedback matrix of the most recent game's word set, or None before the first guess.
+    #                This is only used to find the feedback matrix for the next guess (see _find_feedback).
+    #   - _tree: the node of the search tree for this player's most recent guess, or None
+    #   - _num_moves: the number of moves made in the game after this player's most recent guess
+    _feedback: Optional[a2_feedback.FeedbackMatrix]
+    _tree: Optional[SearchTree]
+    _num_moves: int
+
+    def __init__(self, num_playouts: int = 1000, time_limit: Optional[float] = None,
+                 exploration: float = DEFAULT_EXPLORATION) -> None:
+        """Initialize this player."""
+        self.num_playouts = num_playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.last_playouts = 0
+        self._feedback = None
+        self._tree = None
+        self._num_moves = 0
+
+    def make_move(self, game: aw.AdversarialWordle) -> str:
+        """Make a move given the current game.
+
+        >>> game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+        >>> guesser = MCTSGuesser(num_playouts=50)
+        >>> guesser.make_move(game) in {'hello', 'words', 'world'}
+        True
+
+        Preconditions:
+            - game.is_guesser_turn()
+        """
+        feedback = self._find_feedback(game)
+        root = self._find_root(game, feedback)
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+
+        playouts = 0
+        while playouts < 1 or (time.perf_counter() < deadline if deadline is not None
+                               else playouts < self.num_playouts):
+            self._playout(root, feedback)
+            playouts += 1
+        self.last_playouts = playouts
+
+        self._tree = root.most_visited_subtree()
+        self._tree.make_root()
+        self._num_moves = game.state.num_moves + 1
+        return self._tree.guess()
+
+    def _find_feedback(self, game: aw.AdversarialWordle) -> a2_feedback.FeedbackMatrix:
+        """Return a feedback matrix that contains every possible answer of game, reusing the matrix of
+        the game's word set or of this player's previous guess if possible.
+        """
+        state = game.state
+        if state.config.feedback is not None:
+            self._feedback = state.config.feedback
+        elif self._feedback is None or any(word not in self._feedback for word in state.possible_answers):
+            self._feedback = a2_feedback.compute_feedback_matrix(game.word_set)
+        return self._feedback
+
+    def _find_root(self, game: aw.AdversarialWordle, feedback: a2_feedback.FeedbackMatrix) -> SearchTree:
+        """Return the node of the search tree for the current state of game, reusing the subtree for
+        the Adversary's most recent status if this player made the previous guess in the same game.
+        """
+        state = game.state
+        if self._tree is not None and state.num_moves == self._num_moves + 1 \
+                and state.parent is not None and state.parent.move == self._tree.move:
+            root = self._tree.find_subtree_by_code(state.move_code)
+            if root is not None:
+                root.make_root()
+                return root
+
+        answer_ids = tuple(sorted(feedback.word_id(word) for word in state.possible_answers))
+        return SearchTree(state.move if state.move is not None else a2_game_tree.GAME_START_MOVE,
+                          answer_ids, state.guesses_remaining)
+
+    def _playout(self, root: SearchTree, feedback: a2_feedback.FeedbackMatrix) -> None:
+        """Run one playout from root, and record its result in every node it passed through."""
+        path = [root]
+        node = root
+        while node.winner is None:
+            if node.is_guesser_turn():
+                if node.has_untried_guess():
+                    guess_id = node.pop_untried_guess()
+                    child = SearchTree(feedback.words[guess_id], node.answer_ids, node.guesses_remaining - 1)
+                    node.attach_subtree(child)
+                    path.append(child)
+                    node = child
+                    break
+                node = node.best_subtree(self.exploration)
+            else:
+                node = self._chance_child(node, feedback)
+            path.append(node)
+
+        if node.winner is not None:
+            guesser_won = node.winner == 'Guesser'
+        else:
+            guesser_won = self._rollout(node.answer_ids, feedback.word_id(node.guess()), node.guesses_remaining,
+                                        feedback)
+
+        for visited in path:
+            visited.record_playout(guesser_won)
+
+    def _chance_child(self, node: SearchTree, feedback: a2_feedback.FeedbackMatrix) -> SearchTree:
+        """Return the subtree of node (on the Adversary's turn) for a status chosen as a RandomAdversary
+        would choose it, adding the subtree to the tree if it is not there yet.
+        """
+        guess_id = feedback.word_id(node.guess())
+        answer_id = _random_answer(node.answer_ids, guess_id)
+        row = feedback.row(guess_id)
+        pattern = row[answer_id]
+        status_code = a2_moves.status_code(pattern, feedback.word_size)
+
+        child = node.find_subtree_by_code(status_code)
+        if child is None:
+            if answer_id == guess_id:
+                winner = 'Guesser'
+            elif node.guesses_remaining == 0:
+                winner = 'Adversary'
+            else:
+                winner = None
+            answer_ids = tuple(word_id for word_id in node.answer_ids if row[word_id] == pattern)
+            child = SearchTree(a2_moves.decode_status(status_code), answer_ids, node.guesses_remaining, winner)
+            node.attach_subtree(child)
+        return child
+
+    def _rollout(self, answer_ids: tuple[int, ...] | list[int], guess_id: int, guesses_remaining: int,
+                 feedback: a2_feedback.FeedbackMatrix) -> bool:
+        """Finish a game between a RandomGuesser and a RandomAdversary, starting on the Adversary's turn
+        with the given possible answers, the guess with id guess_id, and guesses_remaining guesses left
+        after it. Return whether the Guesser won.
+        """
+        while True:
+            if len(answer_ids) == 1:
+                return True
+            elif guesses_remaining == 0:
+                return False
+
+            answer_id = _random_answer(answer_ids, guess_id)
+            row = feedback.row(guess_id)
+            pattern = row[answer_id]
+            answer_ids = [word_id for word_id in answer_ids if row[word_id] == pattern]
+            guess_id = random.choice(answer_ids)
+            guesses_remaining -= 1
+
+
+def _random_answer(answer_ids: tuple[int, ...] | list[int], guess_id: int) -> int:
+    """Return a random id from answer_ids other than guess_id, as a RandomAdversary would choose it
+    (or guess_id, if it is the only id).
+
+    Preconditions:
+        - guess_id in answer_ids
+    """
+    if len(answer_ids) == 1:
+        return guess_id
+    while True:
+        answer_id = random.choice(answer_ids)
+        if answer_id != guess_id:
+            return answer_id
+
+
+def benchmark_time_budgets(word_set_file: str, max_guesses: int, time_budgets: list[float],
+                           num_games: int, seed: Optional[int] = None) -> dict[float, dict[str, float]]:
+    """Play num_games games between an MCTSGuesser and a RandomAdversary for each per-move time budget
+    (in seconds) in time_budgets, and return the Guesser's win rate and average number of playouts per
+    guess for each budget.
+
+    Preconditions:
+        - same preconditions for word_set_file and max_guesses as a2_adversarial_wordle.run_game
+        - all(budget > 0 for budget in time_budgets)
+        - num_games >= 1
+    """
+    results = {}
+    for budget in time_budgets:
+        playouts = []
+        if seed is not None:
+            random.seed(f'{seed}:{budget}')
+
+        wins = 0
+        for _ in range(0, num_games):
+            guesser = _CountingMCTSGuesser(time_limit=budget)
+            game = aw.run_game(guesser, aw.RandomAdversary(), word_set_file, max_guesses)
+            wins += game.get_winner() == 'Guesser'
+            playouts.extend(guesser.playouts)
+
+        results[budget] = {'win_rate': wins / num_games,
+                           'playouts_per_guess': sum(playouts) / len(playouts)}
+    return results
+
+
+class _CountingMCTSGuesser(MCTSGuesser):
+    """An MCTSGuesser that remembers the number of playouts it ran before each of its guesses."""
+    playouts: list[int]
+
+    def __init__(self, time_limit: float) -> None:
+        """Initialize this player with the given time limit."""
+        super().__init__(time_limit=time_limit)
+        self.playouts = []
+
+    def make_move(self, game: aw.AdversarialWordle) -> str:
+        """Make a move given the current game, and record the number of playouts it took."""
+        guess = super().make_move(game)
+        self.playouts.append(self.last_playouts)
+        return guess
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
+
+    # Win rate against a RandomAdversary for several time budgets per guess
+    # print(benchmark_time_budgets('data/words/official_wordle_100.txt', 3, [0.001, 0.01, 0.05, 0.2], 100, seed=111))
@@ -0,0 +1,214 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Move Codes)
+
+Module Description
+==================
+
+This module contains an integer encoding of Adversarial Wordle moves. Game trees, game states and the
+tree-based players store and compare *move codes* internally, so that looking up a subtree or comparing
+two moves is a small-integer operation rather than hashing a tuple of one-character strings. Moves are
+only decoded at the edges (printing, loading games from CSV files, and get_move_sequence).
+
+The move code of
+    - a2_game_tree.GAME_START_MOVE is GAME_START_CODE (-1),
+    - a guess is its *guess id*, a non-negative integer, and
+    - a status of length k whose pattern code is p (see a2_feedback) is -1 - (3 ** k + p), which is
+      always less than GAME_START_CODE. (Adding 3 ** k keeps the length of the status in its code.)
+
+Guess ids are assigned in the order guesses are first encoded in this process, so move codes are only
+valid inside the process that created them: two processes give the same guess the same id only if they
+happen to encode the same guesses in the same order. Move codes must not be sent to another process or
+saved to a file; send or save the decoded moves instead.
+
+The registry of guess ids grows with every distinct guess encoded, and is never shrunk automatically.
+A long-running process that has finished with every tree, game and player of one word set can free it
+with reset_guess_ids before moving on to another word set.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import sys
+
+import a2_feedback
+
+# The move code of a2_game_tree.GAME_START_MOVE (which is duplicated here to avoid a circular import)
+GAME_START_MOVE = '*'
+GAME_START_CODE = -1
+
+# The character statuses with each pattern code digit (these are a2_adversarial_wordle's INCORRECT,
+# WRONG_POSITION and CORRECT, indexed by their digits)
+_DIGIT_CHARS = {a2_feedback.INCORRECT_DIGIT: 'N',
+                a2_feedback.WRONG_POSITION_DIGIT: '?',
+                a2_feedback.CORRECT_DIGIT: 'Y'}
+_CHAR_DIGITS = {char_status: digit for digit, char_status in _DIGIT_CHARS.items()}
+
+# The guesses that have been encoded in this process, indexed by guess id, and the inverse mapping
+_guesses: list[str] = []
+_guess_ids: dict[str, int] = {}
+
+# Caches of status encodings and decodings, so that equal statuses decode to the same tuple
+_status_codes: dict[tuple[str, ...], int] = {}
+_statuses: dict[int, tuple[str, ...]] = {}
+
+
+def encode_move(move: str | tuple[str, ...]) -> int:
+    """Return the move code of the given move.
+
+    >>> encode_move(GAME_START_MOVE)
+    -1
+    >>> encode_move(('N', '?', 'Y', 'N', 'N'))
+    -265
+    >>> decode_move(encode_move('hello'))
+    'hello'
+    """
+    if isinstance(move, str):
+        return GAME_START_CODE if move == GAME_START_MOVE else encode_guess(move)
+    else:
+        return encode_status(move)
+
+
+def decode_move(code: int) -> str | tuple[str, ...]:
+    """Return the move with the given move code.
+
+    Preconditions:
+        - code was returned by encode_move in this process
+    """
+    if code >= 0:
+        return _guesses[code]
+    elif code == GAME_START_CODE:
+        return GAME_START_MOVE
+    else:
+        return decode_status(code)
+
+
+def encode_guess(guess: str) -> int:
+    """Return the guess id of the given guess, assigning it a new id if it has not been encoded before."""
+    guess_id = _guess_ids.get(guess)
+    if guess_id is None:
+        guess = sys.intern(guess)
+        guess_id = len(_guesses)
+        _guesses.append(guess)
+        _guess_ids[guess] = guess_id
+    return guess_id
+
+
+def num_guess_ids() -> int:
+    """Return the number of guess ids that have been assigned in this process (since the last reset)."""
+    return len(_guesses)
+
+
+def reset_guess_ids() -> None:
+    """Forget every guess id assigned so far, so that the registry of guesses can be freed.
+
+    Every move code of a guess encoded before the reset becomes invalid (and may later be assigned to a
+    different guess), so this must only be called when no game tree, game state, player or compact game
+    tree that stores move codes is still in use.
+
+    >>> code = encode_guess('hello')
+    >>> reset_guess_ids()
+    >>> num_guess_ids()
+    0
+    >>> decode_guess(encode_guess('words'))
+    'words'
+    """
+    _guesses.clear()
+    _guess_ids.clear()
+
+
+def decode_guess(code: int) -> str:
+    """Return the guess with the given guess id.
+
+    Preconditions:
+        - code was returned by encode_guess in this process
+    """
+    return _guesses[code]
+
+
+def status_code(pattern: int, word_size: int) -> int:
+    """Return the move code of the status of length word_size with the given pattern code.
+
+    Preconditions:
+        - word_size >= 1
+        - 0 <= pattern < 3 ** word_size
+    """
+    return -1 - (3 ** word_size + pattern)
+
+
+def status_pattern(code: int, word_size: int) -> int:
+    """Return the pattern code of the status with the given move code.
+
+    Preconditions:
+        - is_status_code(code)
+        - word_size is the length of the status
+    """
+    return -1 - code - 3 ** word_size
+
+
+def all_correct_status_code(word_size: int) -> int:
+    """Return the move code of the "all correct" status of length word_size."""
+    return status_code(a2_feedback.all_correct_code(word_size), word_size)
+
+
+def encode_status(status: tuple[str, ...]) -> int:
+    """Return the move code of the given status.
+
+    Preconditions:
+        - len(status) >= 1
+        - status contains only the character statuses 'Y', '?' and 'N'
+    """
+    code = _status_codes.get(status)
+    if code is None:
+        pattern = 0
+        for char_status in reversed(status):
+            pattern = pattern * 3 + _CHAR_DIGITS[char_status]
+        code = status_code(pattern, len(status))
+        _status_codes[status] = code
+    return code
+
+
+def decode_status(code: int) -> tuple[str, ...]:
+    """Return the status with the given move code.
+
+    >>> decode_status(encode_status(('N', '?', 'Y', 'N', 'N')))
+    ('N', '?', 'Y', 'N', 'N')
+    >>> decode_status(status_code(0, 3))
+    ('N', 'N', 'N')
+
+    Preconditions:
+        - is_status_code(code)
+    """
+    status = _statuses.get(code)
+    if status is None:
+        value = -1 - code  # == 3 ** word_size + pattern
+        chars = []
+        while value >= 3:
+            value, digit = divmod(value, 3)
+            chars.append(_DIGIT_CHARS[digit])
+        status = tuple(chars)
+        _statuses[code] = status
+        _status_codes.setdefault(status, code)
+    return status
+
+
+def is_status_code(code: int) -> bool:
+    """Return whether code is the move code of a status."""
+    return code < GAME_START_CODE
+
+
+def is_guess_code(code: int) -> bool:
+    """Return whether code is the move code of a guess."""
+    return code >= 0
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
@@ -20,10 +20,13 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
 """
 import csv
+import os
 import random
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
 
 import a2_game_tree
+import a2_moves
 import a2_adversarial_wordle as aw  # aw is a short-form to save some typing
 
 
@@ -86,6 +89,144 @@ def load_game_tree(games_file: str) -> a2_game_tree.GameTree:
     return game_tree
 
 
+def load_game_tree_bulk(games_file: str, chunk_size: int = 1 << 22, workers: int = 1,
+                        progress: Optional[Callable[[int, int], None]] = None) -> a2_game_tree.GameTree:
+    """Return a new game tree based on games_file, like load_game_tree, but built for very large files.
+
+    The file is read in chunks of about chunk_size bytes. The rows of each chunk are converted to move
+    codes (a cell is a status exactly when it is at an odd position in its row, since the moves of a
+    game alternate), with repeated rows removed, sorted so that rows with a shared prefix are next to
+    each other, and inserted by reusing the path of the previous row. The guesser win probabilities are
+    computed once at the end.
+    Only one chunk of rows is held in memory at a time.
+
+    If workers > 1, the file is split into that many byte ranges, each range is loaded by a separate
+    process, and the resulting trees are merged. If progress is not None, it is called as
+    progress(bytes_loaded, total_bytes) after each chunk (or, with workers > 1, after each range).
+
+    The returned tree has the same nodes as load_game_tree(games_file), but the subtrees of a node may
+    be in a different order.
+
+    Preconditions:
+        - games_file refers to a csv file in the format described on the assignment handout
+        - chunk_size >= 1
+        - workers >= 1
+
+    >>> tree = load_game_tree_bulk('data/games/small_sample.csv')
+    >>> tree.stats() == load_game_tree('data/games/small_sample.csv').stats()
+    True
+    >>> sharded_tree = load_game_tree_bulk('data/games/guesser_wins.csv', chunk_size=1000, workers=3)
+    >>> sharded_tree.stats() == load_game_tree('data/games/guesser_wins.csv').stats()
+    True
+    """
+    total_bytes = os.path.getsize(games_file)
+    if workers == 1:
+        game_tree = a2_game_tree.GameTree(a2_game_tree.GAME_START_MOVE)
+        _load_byte_range(games_file, 0, total_bytes, chunk_size, game_tree, progress)
+    else:
+        boundaries = [total_bytes * i // workers for i in range(0, workers + 1)]
+        tasks = [(games_file, boundaries[i], boundaries[i + 1], chunk_size) for i in range(0, workers)]
+        game_tree = None
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for i, encoding in enumerate(executor.map(_load_shard, tasks)):
+                shard_tree = a2_game_tree.decode_game_tree(encoding)
+                if game_tree is None:
+                    game_tree = shard_tree
+                else:
+                    game_tree.merge(shard_tree)
+                if progress is not None:
+                    progress(boundaries[i + 1], total_bytes)
+
+    game_tree.evaluate_guesser_win_probabilities()
+    return game_tree
+
+
+def _load_shard(task: tuple[str, int, int, int]) -> tuple:
+    """Return the encoding (see a2_game_tree.encode_game_tree) of the game tree for the rows of a byte
+    range of a games file, in a worker process of load_game_tree_bulk."""
+    games_file, start, end, chunk_size = task
+    game_tree = a2_game_tree.GameTree(a2_game_tree.GAME_START_MOVE)
+    _load_byte_range(games_file, start, end, chunk_size, game_tree, None)
+    return a2_game_tree.encode_game_tree(game_tree)
+
+
+def _load_byte_range(games_file: str, start: int, end: int, chunk_size: int, game_tree: a2_game_tree.GameTree,
+                     progress: Optional[Callable[[int, int], None]]) -> None:
+    """Insert the rows of games_file that start in the byte range [start, end) into game_tree, without
+    updating any guesser win probabilities.
+
+    A row that starts before start but ends after it belongs to the previous range.
+    """
+    total_bytes = os.path.getsize(games_file)
+    with open(games_file, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()  # Skip the rest of the row that the previous range ends with
+        position = f.tell()
+        while position < end:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            # Only keep the lines that start before end
+            chunk = []
+            for line in lines:
+                if position >= end:
+                    break
+                chunk.append(line.decode('utf-8'))
+                position += len(line)
+            if position >= end:
+                f.seek(position)
+
+            # Repeated rows (common in game logs) are only parsed once
+            rows = sorted({_row_codes(row) for row in csv.reader(set(chunk)) if row})
+            _insert_sorted_rows(game_tree, rows)
+            if progress is not None:
+                progress(position - start, total_bytes)
+
+
+# The move codes of the statuses that have been read from CSV files, keyed by their text
+_csv_status_codes: dict[str, int] = {}
+
+
+def _row_codes(row: list[str]) -> tuple[int, ...]:
+    """Return the move codes (see a2_moves) of the moves in the given CSV row."""
+    codes = []
+    for i, cell in enumerate(row):
+        if i % 2 == 0:
+            codes.append(a2_moves.encode_guess(cell))
+        else:
+            code = _csv_status_codes.get(cell)
+            if code is None:
+                code = a2_moves.encode_status(tuple(cell))
+                _csv_status_codes[cell] = code
+            codes.append(code)
+    return tuple(codes)
+
+
+def _insert_sorted_rows(game_tree: a2_game_tree.GameTree, rows: list[tuple[int, ...]]) -> None:
+    """Insert the given rows of move codes into game_tree, without updating any guesser win probabilities.
+
+    The rows are sorted, so each row is inserted starting from the end of its longest common
+    prefix with the previous row.
+    """
+    path = [game_tree]
+    previous_row = ()
+    for row in rows:
+        common = 0
+        while common < len(row) and common < len(previous_row) and row[common] == previous_row[common]:
+            common += 1
+        del path[common + 1:]
+
+        for code in row[common:]:
+            node = path[-1]
+            subtree = node.find_subtree_by_code(code)
+            if subtree is None:
+                subtree = a2_game_tree.GameTree.from_move_code(code)
+                node.attach_subtree(subtree)
+            path.append(subtree)
+        previous_row = row
+
+
 ###############################################################################
 # Part 1, Question 3 and 4 (Tree-based Random AIs)
 ###############################################################################
@@ -122,11 +263,11 @@ class RandomTreeGuesser(aw.Guesser):
         Preconditions:
         - game.is_guesser_turn()
         """
-        if self._game_tree is not None and self._game_tree.move != a2_game_tree.GAME_START_MOVE:
+        if self._game_tree is not None and self._game_tree.move_code != a2_moves.GAME_START_CODE:
             if self._game_tree.get_subtrees() == []:
                 self._game_tree = None
             else:
-                self._game_tree = self._game_tree.find_subtree_by_move(game.get_move_sequence().pop())
+                self._game_tree = self._game_tree.find_subtree_by_code(game.state.move_code)
 
         if self._game_tree is None or self._game_tree.get_subtrees() == []:
             possible_answers = game.get_possible_answers()
@@ -166,7 +307,7 @@ class RandomTreeAdversary(aw.Adversary):
             if self._game_tree.get_subtrees() == []:
                 self._game_tree = None
             else:
-                self._game_tree = self._game_tree.find_subtree_by_move(game.get_move_sequence().pop())
+                self._game_tree = self._game_tree.find_subtree_by_code(game.state.move_code)
 
         if self._game_tree is None or self._game_tree.get_subtrees() == []:
             possible_answers = game.get_possible_answers()
@@ -247,8 +388,9 @@ if __name__ == '__main__':
     #
     # python_ta.check_all(config={
     #     'max-line-length': 120,
-    #     'extra-imports': ['a2_adversarial_wordle', 'a2_game_tree', 'random', 'csv'],
-    #     'allowed-io': ['load_game_tree']
+    #     'extra-imports': ['a2_adversarial_wordle', 'a2_game_tree', 'a2_moves', 'random', 'csv', 'os',
+    #                       'concurrent.futures'],
+    #     'allowed-io': ['load_game_tree', 'load_game_tree_bulk', '_load_byte_range']
     # })
 
     # Sample call to part1_runner (you can change this, just keep it in the main block!)
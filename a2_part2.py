@@ -20,14 +20,97 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
 """
 import random
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
 
+import a2_feedback
 import a2_game_tree
+import a2_moves
+import a2_word_sets
 import a2_adversarial_wordle as aw
 
 
+class TranspositionTable:
+    """A bounded cache of generated game trees, keyed by canonical game state signatures.
+
+    When generate_complete_game_tree is given a transposition table, two move sequences that reach
+    equivalent game states (see aw.GameState.signature) share a single GameTree object, which turns
+    the complete game tree into a directed acyclic graph.
+
+    Instance Attributes:
+        - max_entries: the maximum number of trees stored in this table
+        - hits: the number of lookups that found a stored tree
+        - misses: the number of lookups that did not find a stored tree
+        - evictions: the number of trees removed to stay within max_entries
+
+    Representation Invariants:
+        - self.max_entries >= 1
+        - len(self._entries) <= self.max_entries
+    """
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+    # Private Instance Attributes:
+    #   - _entries: the stored trees, ordered from least to most recently used
+    _entries: OrderedDict[tuple, a2_game_tree.GameTree]
+
+    def __init__(self, max_entries: int = 1_000_000) -> None:
+        """Initialize a new, empty transposition table that stores at most max_entries trees."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of trees stored in this table."""
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        """Return the state of this table for pickling.
+
+        The keys of the stored trees contain move codes, which are only meaningful in the process that
+        created them (see a2_moves), so the stored trees are not pickled: an unpickled table is empty.
+
+        >>> import pickle
+        >>> table = TranspositionTable(10)
+        >>> table.store((a2_moves.encode_guess('hello'), 1, ()), a2_game_tree.GameTree('hello'))
+        >>> copied_table = pickle.loads(pickle.dumps(table))
+        >>> len(copied_table), copied_table.max_entries
+        (0, 10)
+        """
+        state = dict(self.__dict__)
+        state['_entries'] = OrderedDict()
+        return state
+
+    def lookup(self, key: tuple) -> Optional[a2_game_tree.GameTree]:
+        """Return the tree stored under key, or None if there is no such tree."""
+        tree = self._entries.get(key)
+        if tree is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return tree
+
+    def store(self, key: tuple, tree: a2_game_tree.GameTree) -> None:
+        """Store tree under key, evicting the least recently used tree if this table is full."""
+        self._entries[key] = tree
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the hit, miss, eviction and size statistics of this table."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries)}
+
+
 def generate_complete_game_tree(root_move: str | tuple[str, ...], game_state: aw.AdversarialWordle,
-                                d: int) -> a2_game_tree.GameTree:
+                                d: int, stats: Optional[dict[str, int]] = None,
+                                transpositions: Optional[TranspositionTable] = None) -> a2_game_tree.GameTree:
     """Generate a complete game tree of depth d for all valid moves from the current game_state.
 
     For the returned GameTree:
@@ -39,6 +122,16 @@ def generate_complete_game_tree(root_move: str | tuple[str, ...], game_state: aw
     with a winner in fewer than d moves. Concretely, if game_state.get_winner() is not None,
     then return just a size-one GameTree containing the root move.
 
+    On the Adversary's turn, the possible answers are first grouped by their status, and each
+    distinct status is expanded exactly once. If stats is not None, stats['redundant_expansions_avoided']
+    is increased by the number of possible answers whose status was already expanded (that is, the number
+    of subtrees the generator would otherwise have built and thrown away).
+
+    If transpositions is not None, subtrees for equivalent game states (with the same root move and
+    remaining depth) are generated once and shared, so the returned tree may contain the same GameTree
+    object in several places. Its size, string representation and win probabilities are the same as
+    those of the unshared tree, but it must not be mutated (for example, with insert_move_sequence).
+
     Preconditions:
         - d >= 0
         - root_move == a2_game_tree.GAME_START_MOVE or root_move is a valid move
@@ -69,52 +162,386 @@ def generate_complete_game_tree(root_move: str | tuple[str, ...], game_state: aw
     >>> tree_hello = generate_complete_game_tree('hello', example_game, 3)
     >>> len(tree_hello)
     7
-    Implementation hints:
-        - This function must be implemented recursively.
-        - In the recursive step, use the AdversarialWordle's copy_and_record_guesser_move/
-          copy_and_record_adversary_move methods to create a copy of the game_state with one new move made.
-          You should NOT mutate the input game_state in this function.
-        - You'll need to review the public interface of the AdversarialWordle class to see what
-          methods are available to help implement this function.
-        - Remember that the Guesser can only choose guesses from the current possible answers,
-          which may be significantly fewer than the full word set. This is important for making
-          sure your game tree isn't larger than it should be!
+    >>> stats = {'redundant_expansions_avoided': 0}
+    >>> tree_same = generate_complete_game_tree(a2_game_tree.GAME_START_MOVE,
+    ...                                         aw.AdversarialWordle({'aaa', 'aab', 'aac', 'bbb'}, 2), 2, stats)
+    >>> len(tree_same)
+    13
+    >>> stats['redundant_expansions_avoided']
+    4
+    >>> table = TranspositionTable()
+    >>> tree_shared = generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, example_game, 3, transpositions=table)
+    >>> len(tree_shared)
+    16
+    >>> table.get_stats()['hits'] > 0
+    True
+
+    Implementation notes:
+        - The tree is generated depth-first with an explicit stack instead of recursion, so its depth
+          is not limited by Python's recursion limit.
+        - Each new game state is created with the AdversarialWordle's copy_and_record_guesser_move/
+          copy_and_record_adversary_move methods, so the input game_state is not mutated.
+        - The Guesser can only choose guesses from the current possible answers.
     """
     if game_state.is_guesser_turn() and isinstance(root_move, str) and root_move != a2_game_tree.GAME_START_MOVE:
-        new_game_state = game_state.copy_and_record_guesser_move(root_move)
-        return generate_complete_game_tree(root_move, new_game_state, d)
+        game_state = game_state.copy_and_record_guesser_move(root_move)
+
+    # Each stack entry is (parent, move code, state, depth, tree, key). If tree is None, the subtree for
+    # the move (from state, with the given depth) still has to be generated. Otherwise, every subtree of
+    # tree has been generated, and tree is ready to be stored under key and added to parent.
+    # The root's "parent" is the list finished, which receives the generated tree.
+    finished = []
+    stack = [(finished, a2_moves.encode_move(root_move), game_state, d, None, None)]
+    while stack:
+        parent, curr_move, state, depth, tree_created, key = stack.pop()
+
+        if tree_created is None:
+            if transpositions is not None:
+                key = (curr_move, depth, state.state.signature())
+                tree_created = transpositions.lookup(key)
+                if tree_created is not None:
+                    _add_generated_subtree(parent, tree_created)
+                    continue
+
+            tree_created = a2_game_tree.GameTree.from_move_code(
+                curr_move, 1.0 if state.get_winner() == 'Guesser' else 0.0)
+
+            if depth > 0 and state.get_winner() is None:
+                if not state.is_guesser_turn():
+                    moves, num_answers = _adversary_statuses(state)
+                    if stats is not None:
+                        stats['redundant_expansions_avoided'] = \
+                            stats.get('redundant_expansions_avoided', 0) + num_answers - len(moves)
+                    new_states = [state.copy_and_record_adversary_move_code(status) for status in moves]
+                else:
+                    guesses = state.get_possible_answers()
+                    moves = [a2_moves.encode_guess(guess) for guess in guesses]
+                    new_states = [state.copy_and_record_guesser_move(guess) for guess in guesses]
+
+                stack.append((parent, curr_move, state, depth, tree_created, key))
+                # Push the subtrees in reverse so that they are generated (and added) in order
+                for i in range(len(moves) - 1, -1, -1):
+                    stack.append((tree_created, moves[i], new_states[i], depth - 1, None, None))
+                continue
+
+        if transpositions is not None:
+            transpositions.store(key, tree_created)
+        _add_generated_subtree(parent, tree_created)
+
+    return finished[0]
+
+
+def _add_generated_subtree(parent: a2_game_tree.GameTree | list[a2_game_tree.GameTree],
+                           subtree: a2_game_tree.GameTree) -> None:
+    """Add a finished subtree to its parent in generate_complete_game_tree.
+
+    The parent of the root is a list, which the root is appended to. The subtree may be shared with
+    other parents through a transposition table.
+    """
+    if isinstance(parent, list):
+        parent.append(subtree)
+    else:
+        parent.add_subtree(subtree, shared=True)
 
-    tree_created = a2_game_tree.GameTree(root_move)
 
-    if game_state.get_winner() == 'Guesser':
-        tree_created.guesser_win_probability = 1.0
-    else:
-        tree_created.guesser_win_probability = 0.0
+def generate_complete_game_tree_parallel(root_move: str | tuple[str, ...], game_state: aw.AdversarialWordle,
+                                         d: int, workers: Optional[int] = None, split_depth: int = 1,
+                                         use_transpositions: bool = True) -> a2_game_tree.GameTree:
+    """Return the same game tree as generate_complete_game_tree, generated by a pool of worker processes.
+
+    The first split_depth levels of the tree are generated in this process. Each subtree below them
+    is generated independently by one of the workers (a process pool with the given number of workers,
+    which defaults to the number of CPUs), sent back using a2_game_tree.encode_game_tree, and added to
+    the top levels, which computes the guesser win probabilities of the top levels as usual.
+
+    If use_transpositions is True, each worker shares equivalent subtrees within its own subtrees
+    (see TranspositionTable).
+
+    Preconditions:
+        - the preconditions of generate_complete_game_tree hold for root_move, game_state and d
+        - workers is None or workers >= 1
+        - split_depth >= 1
+
+    >>> example_game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+    >>> tree = generate_complete_game_tree_parallel(a2_game_tree.GAME_START_MOVE, example_game, 3, workers=2)
+    >>> len(tree)
+    16
 
+    The tree has the same moves and guesser win probabilities as the serial one, with or without
+    transposition tables and for any split depth:
+
+    >>> def canonical(tree: a2_game_tree.GameTree) -> tuple:
+    ...     subtrees = sorted((canonical(subtree) for subtree in tree.get_subtrees()), key=repr)
+    ...     return (tree.move, tree.guesser_win_probability, subtrees)
+    >>> word_set = a2_word_sets.load_word_set('data/words/official_wordle_25.txt')
+    >>> example_game = aw.AdversarialWordle(word_set, 3)
+    >>> serial_tree = canonical(generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, example_game, 4))
+    >>> all(canonical(generate_complete_game_tree_parallel(a2_game_tree.GAME_START_MOVE, example_game, 4, workers=2,
+    ...                                                    split_depth=split_depth,
+    ...                                                    use_transpositions=use_transpositions)) == serial_tree
+    ...     for split_depth in [1, 2] for use_transpositions in [False, True])
+    True
+    """
+    frontier = []
+    _generate_top_levels(root_move, game_state, d, split_depth, frontier, None)
+
+    # Each task is the move sequence that reaches a subtree from the start of the game,
+    # together with the root move and depth of that subtree
+    tasks = [(state.get_move_sequence(), move, depth) for move, state, depth in frontier]
+    config = game_state.state.config
+    initargs = (config.word_set, config.max_guesses, config.feedback is not None, use_transpositions)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        encodings = list(executor.map(_generate_subtree, tasks, chunksize=max(1, len(tasks) // (8 * (workers or 4)))))
+
+    subtrees = (a2_game_tree.decode_game_tree(encoding) for encoding in encodings)
+    return _generate_top_levels(root_move, game_state, d, split_depth, [], subtrees)
+
+
+def _generate_top_levels(root_move: str | tuple[str, ...], game_state: aw.AdversarialWordle, d: int,
+                         split_depth: int, frontier: list[tuple[str | tuple[str, ...], aw.AdversarialWordle, int]],
+                         subtrees: Optional[Iterator[a2_game_tree.GameTree]]) -> a2_game_tree.GameTree:
+    """Generate the first split_depth levels of the complete game tree, like generate_complete_game_tree.
+
+    Every subtree below these levels that still needs to be expanded is either appended to frontier
+    as a (root move, game state, depth) tuple, if subtrees is None, or taken from subtrees otherwise.
+    The subtrees are visited in the same order both times, so passing the trees generated for the
+    frontier of one call as subtrees to a second call produces the complete game tree.
+    """
+    if game_state.is_guesser_turn() and isinstance(root_move, str) and root_move != a2_game_tree.GAME_START_MOVE:
+        new_game_state = game_state.copy_and_record_guesser_move(root_move)
+        return _generate_top_levels(root_move, new_game_state, d, split_depth, frontier, subtrees)
+
+    if split_depth == 0 and d > 0 and game_state.get_winner() is None:
+        if subtrees is None:
+            frontier.append((root_move, game_state, d))
+            return a2_game_tree.GameTree(root_move)
+        else:
+            return next(subtrees)
+
+    tree_created = a2_game_tree.GameTree(root_move, 1.0 if game_state.get_winner() == 'Guesser' else 0.0)
     if d == 0 or game_state.get_winner() is not None:
         return tree_created
 
+    if not game_state.is_guesser_turn():
+        moves = [a2_moves.decode_status(status) for status in _adversary_statuses(game_state)[0]]
+        new_states = [game_state.copy_and_record_adversary_move(status) for status in moves]
     else:
-        if not game_state.is_guesser_turn():
-            possible_answers = game_state.get_possible_answers()
-            current_guess = game_state.guesses[-1]
-            if len(possible_answers) > 1:
-                possible_answers.remove(current_guess)
+        moves = game_state.get_possible_answers()
+        new_states = [game_state.copy_and_record_guesser_move(guess) for guess in moves]
+
+    for curr_move, new_game_state in zip(moves, new_states):
+        tree_created.add_subtree(_generate_top_levels(curr_move, new_game_state, d - 1, split_depth - 1,
+                                                      frontier, subtrees))
+    return tree_created
+
 
-            for possible_ans in possible_answers:
-                curr_move = game_state.get_status_for_answer(possible_ans)
-                new_game_state = game_state.copy_and_record_adversary_move(curr_move)
-                subtree = generate_complete_game_tree(curr_move, new_game_state, d - 1)
-                tree_created.add_subtree(subtree)
+def _adversary_statuses(game_state: aw.AdversarialWordle) -> tuple[list[int], int]:
+    """Return the move codes (see a2_moves) of the distinct statuses the Adversary can return in game_state,
+    in the order of the first possible answer with each status, together with the number of possible
+    answers they come from.
 
+    Preconditions:
+        - not game_state.is_guesser_turn()
+    """
+    answers_by_status = game_state.state.partition_by_status_code()
+    statuses = list(answers_by_status)
+    num_answers = sum(len(answers) for answers in answers_by_status.values())
+
+    # The "all correct" status only comes from the current guess, which the Adversary
+    # avoids whenever there is another possible answer
+    all_correct = game_state.state.config.all_correct_code
+    if num_answers > 1 and all_correct in answers_by_status:
+        statuses.remove(all_correct)
+        num_answers -= 1
+
+    return statuses, num_answers
+
+
+# The starting game state and transposition setting of a worker process (see _init_worker)
+_worker_game: Optional[aw.AdversarialWordle] = None
+_worker_use_transpositions: bool = False
+
+
+def _init_worker(word_set: frozenset[str], max_guesses: int, use_feedback: bool, use_transpositions: bool) -> None:
+    """Set up a worker process for generate_complete_game_tree_parallel."""
+    global _worker_game, _worker_use_transpositions
+    feedback = None
+    if use_feedback and isinstance(word_set, a2_word_sets.WordSet):
+        feedback = word_set.feedback
+    elif use_feedback:
+        feedback = a2_feedback.compute_feedback_matrix(word_set)
+    _worker_game = aw.AdversarialWordle(word_set, max_guesses, feedback)
+    _worker_use_transpositions = use_transpositions
+
+
+def _generate_subtree(task: tuple[list[str | tuple[str, ...]], str | tuple[str, ...], int]) -> tuple:
+    """Return the encoding of the complete game tree for the given task in a worker process."""
+    moves, root_move, d = task
+    game_state = _worker_game
+    for move in moves:
+        if isinstance(move, str):
+            game_state = game_state.copy_and_record_guesser_move(move)
         else:
-            for possible_ans in game_state.get_possible_answers():
-                curr_move = possible_ans
-                new_game_state = game_state.copy_and_record_guesser_move(curr_move)
-                subtree = generate_complete_game_tree(curr_move, new_game_state, d - 1)
-                tree_created.add_subtree(subtree)
+            game_state = game_state.copy_and_record_adversary_move(move)
 
-        return tree_created
+    transpositions = TranspositionTable() if _worker_use_transpositions else None
+    subtree = generate_complete_game_tree(root_move, game_state, d, transpositions=transpositions)
+    return a2_game_tree.encode_game_tree(subtree)
+
+
+# The default number of moves that LazyGameTree looks ahead to compute a guesser win probability:
+# a status, a guess, and the status after it (so that the Guesser can win within the lookahead)
+DEFAULT_LOOKAHEAD = 3
+
+# The default maximum number of trees in the transposition table of a LazyGameTree
+DEFAULT_LAZY_TABLE_SIZE = 100_000
+
+
+class LazyGameTree(a2_game_tree.GameTree):
+    """A complete game tree whose subtrees are generated from a game state only when they are needed.
+
+    The subtrees of a LazyGameTree are generated the first time get_subtrees or find_subtree_by_move
+    (or find_subtree_by_code) is called, and its guesser win probability is computed the first time it
+    is accessed, by evaluating the complete game tree of depth min(depth, lookahead) below it. These
+    evaluations share one transposition table, which keeps at most max_table_entries trees, so
+    equivalent game states are usually evaluated once.
+
+    Creating a LazyGameTree takes O(1) time. Accessing a guesser win probability takes time (and
+    temporary memory) proportional to the size of the complete game tree of depth min(depth, lookahead)
+    below the node, which grows very quickly with lookahead: a GreedyTreeGuesser reads the probability
+    of every guess in each state it reaches. With the default lookahead (DEFAULT_LOOKAHEAD), a
+    probability is the chance that the Guesser wins within the next guess, which is cheap to compute.
+
+    With lookahead=None, every node has the same moves and guesser win probability as the corresponding
+    node of generate_complete_game_tree(root_move, game_state, depth), but only the nodes that are
+    actually visited are created; however, the first probability accessed then evaluates the whole
+    complete game tree below its node. (Note that __len__ and __str__ only include nodes that have been
+    generated so far.)
+
+    Representation Invariants:
+        - self._depth >= 0
+        - self._lookahead is None or self._lookahead >= 0
+
+    >>> example_game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+    >>> lazy_tree = LazyGameTree(a2_game_tree.GAME_START_MOVE, example_game, 3, lookahead=None)
+    >>> len(lazy_tree)
+    1
+    >>> sorted(subtree.move for subtree in lazy_tree.get_subtrees())
+    ['hello', 'words', 'world']
+    >>> len(lazy_tree)
+    4
+    >>> complete_tree = generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, example_game, 3)
+    >>> lazy_tree.guesser_win_probability == complete_tree.guesser_win_probability
+    True
+
+    A LazyGameTree can be pickled (for example, to be sent to the worker processes of aw.run_games),
+    including when its word set's feedback matrix is memory-mapped. Its transposition table is pickled
+    empty, since its keys are only valid in this process (see TranspositionTable.__getstate__):
+
+    >>> import pickle
+    >>> word_set = a2_word_sets.load_word_set('data/words/official_wordle_25.txt')
+    >>> lazy_tree = LazyGameTree(a2_game_tree.GAME_START_MOVE, aw.AdversarialWordle(word_set, 3, word_set.feedback), 6)
+    >>> probabilities = sorted(subtree.guesser_win_probability for subtree in lazy_tree.get_subtrees())
+    >>> copied_tree = pickle.loads(pickle.dumps(lazy_tree))
+    >>> sorted(subtree.guesser_win_probability for subtree in copied_tree.get_subtrees()) == probabilities
+    True
+    >>> len(copied_tree.get_subtrees()[0].get_subtrees()) > 0
+    True
+    """
+    # Private Instance Attributes:
+    #   - _game_state: the game state after this tree's move
+    #   - _depth: the depth of the complete game tree that this tree represents
+    #   - _lookahead: the maximum depth used to compute guesser win probabilities, or None for no maximum
+    #   - _expanded: whether the subtrees of this tree have been generated
+    #   - _probability: the guesser win probability of this tree, or None if it has not been computed
+    #   - _transpositions: the transposition table shared by every node of the tree
+    _game_state: aw.AdversarialWordle
+    _depth: int
+    _lookahead: Optional[int]
+    _expanded: bool
+    _probability: Optional[float]
+    _transpositions: TranspositionTable
+
+    def __init__(self, root_move: str | tuple[str, ...], game_state: aw.AdversarialWordle, depth: int,
+                 lookahead: Optional[int] = DEFAULT_LOOKAHEAD, transpositions: Optional[TranspositionTable] = None,
+                 max_table_entries: int = DEFAULT_LAZY_TABLE_SIZE) -> None:
+        """Initialize a lazy game tree with the given root move, game state and depth.
+
+        If transpositions is None, a new transposition table with at most max_table_entries trees is
+        created for the tree.
+
+        Preconditions:
+            - the preconditions of generate_complete_game_tree hold for root_move, game_state and depth
+            - lookahead is None or lookahead >= 0
+            - max_table_entries >= 1
+        """
+        super().__init__(root_move)
+        if game_state.is_guesser_turn() and isinstance(root_move, str) and root_move != a2_game_tree.GAME_START_MOVE:
+            game_state = game_state.copy_and_record_guesser_move(root_move)
+        self._game_state = game_state
+        self._depth = depth
+        self._lookahead = lookahead
+        self._expanded = False
+        self._probability = None
+        self._transpositions = transpositions if transpositions is not None else TranspositionTable(max_table_entries)
+
+    @property
+    def guesser_win_probability(self) -> float:
+        """The probability that the Guesser will win from the current state of the game (within the next
+        lookahead moves).
+        """
+        if self._probability is None:
+            winner = self._game_state.get_winner()
+            if winner is not None or self._depth == 0:
+                self._probability = 1.0 if winner == 'Guesser' else 0.0
+            else:
+                d = self._depth if self._lookahead is None else min(self._depth, self._lookahead)
+                tree = generate_complete_game_tree(self.move, self._game_state, d,
+                                                   transpositions=self._transpositions)
+                self._probability = tree.guesser_win_probability
+        return self._probability
+
+    @guesser_win_probability.setter
+    def guesser_win_probability(self, value: float) -> None:
+        """Set the guesser win probability of this tree."""
+        self._probability = value
+
+    def get_subtrees(self) -> list[a2_game_tree.GameTree]:
+        """Return the subtrees of this game tree, generating them if necessary."""
+        self._expand()
+        return super().get_subtrees()
+
+    def find_subtree_by_code(self, move_code: int) -> Optional[a2_game_tree.GameTree]:
+        """Return the subtree whose move has the given move code, generating the subtrees if necessary.
+
+        Return None if no subtree corresponds to that move.
+        """
+        self._expand()
+        return super().find_subtree_by_code(move_code)
+
+    def _expand(self) -> None:
+        """Generate the subtrees of this tree, if they have not been generated yet."""
+        if self._expanded:
+            return
+        self._expanded = True
+
+        state = self._game_state
+        if self._depth == 0 or state.get_winner() is not None:
+            return
+
+        if not state.is_guesser_turn():
+            moves = [a2_moves.decode_status(status) for status in _adversary_statuses(state)[0]]
+            new_states = [state.copy_and_record_adversary_move(status) for status in moves]
+        else:
+            moves = state.get_possible_answers()
+            new_states = [state.copy_and_record_guesser_move(guess) for guess in moves]
+
+        for move, new_state in zip(moves, new_states):
+            # The subtrees are added directly, since this tree's probability does not depend on
+            # whether they have been generated
+            self.attach_subtree(LazyGameTree(move, new_state, self._depth - 1, self._lookahead,
+                                             self._transpositions))
 
 
 class GreedyTreeGuesser(aw.Guesser):
@@ -142,11 +569,11 @@ class GreedyTreeGuesser(aw.Guesser):
         Preconditions:
             - game.is_guesser_turn()
         """
-        if self._game_tree is not None and self._game_tree.move != a2_game_tree.GAME_START_MOVE:
+        if self._game_tree is not None and self._game_tree.move_code != a2_moves.GAME_START_CODE:
             if self._game_tree.get_subtrees() == []:
                 self._game_tree = None
             else:
-                self._game_tree = self._game_tree.find_subtree_by_move(game.get_move_sequence().pop())
+                self._game_tree = self._game_tree.find_subtree_by_code(game.state.move_code)
 
         if self._game_tree is None or self._game_tree.get_subtrees() == []:
             possible_answers = game.get_possible_answers()
@@ -195,7 +622,7 @@ class GreedyTreeAdversary(aw.Adversary):
             if self._game_tree.get_subtrees() == []:
                 self._game_tree = None
             else:
-                self._game_tree = self._game_tree.find_subtree_by_move(game.get_move_sequence().pop())
+                self._game_tree = self._game_tree.find_subtree_by_code(game.state.move_code)
 
         if self._game_tree is None or self._game_tree.get_subtrees() == []:
             possible_answers = game.get_possible_answers()
@@ -221,13 +648,20 @@ class GreedyTreeAdversary(aw.Adversary):
             return min_prob_subtree.move
 
 
-def part2_runner(word_set_file: str, max_guesses: int, depth: int, num_games: int, guesser_greedy: bool) -> None:
+def part2_runner(word_set_file: str, max_guesses: int, depth: int, num_games: int, guesser_greedy: bool,
+                 workers: int = 1, lazy: bool = False, lookahead: Optional[int] = DEFAULT_LOOKAHEAD) -> None:
     """Create a complete game tree with the given depth, and run num_games games using the following game configuration.
 
     If guesser_greedy is True, the Guesser player is the GreedyTreeGuesser and the Adversary is a RandomAdversary.
     If guesser_greedy is False, the Guesser player is a RandomGuesser and the Adversary is a GreedyTreeAdversary.
 
     In either case, the "Greedy Tree" player uses the complete game tree with the given depth.
+    If workers > 1, the whole tree is generated up front by that many worker processes
+    (see generate_complete_game_tree_parallel). Otherwise, if lazy is True, the tree is a LazyGameTree
+    with the given lookahead, so only the nodes that the games actually visit are generated (and the
+    greedy player's probabilities only look lookahead moves ahead, unless lookahead is None).
+    Otherwise (the default), the whole tree is generated up front with a transposition table, so
+    equivalent game states share one subtree.
 
     word_set_file and max_guesses have the same meaning as in aw.run_games.
 
@@ -235,16 +669,22 @@ def part2_runner(word_set_file: str, max_guesses: int, depth: int, num_games: in
         - word_set_file and max_guesses satisfy the preconditions of aw.run_games
         - depth >= 0
         - num_games >= 1
+        - workers >= 1
+        - lookahead is None or lookahead >= 0
 
     Implementation notes:
         - Your implementation MUST correctly call aw.run_games. You may choose
           the values for the optional arguments passed to the function.
     """
-    with open(word_set_file) as f:
-        word_set = {str.strip(line.lower()) for line in f}
-
-    game = aw.AdversarialWordle(word_set, max_guesses)
-    complete_game_tree = generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, depth)
+    word_set = a2_word_sets.load_word_set(word_set_file)
+    game = aw.AdversarialWordle(word_set, max_guesses, word_set.feedback)
+    if workers > 1:
+        complete_game_tree = generate_complete_game_tree_parallel(a2_game_tree.GAME_START_MOVE, game, depth, workers)
+    elif lazy:
+        complete_game_tree = LazyGameTree(a2_game_tree.GAME_START_MOVE, game, depth, lookahead)
+    else:
+        complete_game_tree = generate_complete_game_tree(a2_game_tree.GAME_START_MOVE, game, depth,
+                                                         transpositions=TranspositionTable())
 
     if guesser_greedy:
         guesser = GreedyTreeGuesser(complete_game_tree)
@@ -277,7 +717,8 @@ if __name__ == '__main__':
     # python_ta.check_all(config={
     #     'max-line-length': 120,
     #     'max-nested-blocks': 4,
-    #     'extra-imports': ['random', 'a2_adversarial_wordle', 'a2_game_tree'],
+    #     'extra-imports': ['random', 'a2_adversarial_wordle', 'a2_game_tree', 'a2_feedback', 'a2_moves',
+    #                       'a2_word_sets', 'collections', 'concurrent.futures'],
     #     'allowed-io': ['part2_runner']
     # })
 
@@ -21,6 +21,7 @@ import random
 from typing import Optional
 
 import a2_game_tree
+import a2_moves
 import a2_adversarial_wordle as aw
 
 
@@ -52,11 +53,11 @@ class ExploringGuesser(aw.Guesser):
         Preconditions:
             - game.is_guesser_turn()
         """
-        if self._game_tree is not None and self._game_tree.move != a2_game_tree.GAME_START_MOVE:
+        if self._game_tree is not None and self._game_tree.move_code != a2_moves.GAME_START_CODE:
             if self._game_tree.get_subtrees() == []:
                 self._game_tree = None
             else:
-                self._game_tree = self._game_tree.find_subtree_by_move(game.get_move_sequence().pop())
+                self._game_tree = self._game_tree.find_subtree_by_code(game.state.move_code)
 
         if self._game_tree is None or self._game_tree.get_subtrees() == []:
             possible_answers = game.get_possible_answers()
@@ -182,7 +183,7 @@ if __name__ == '__main__':
     # python_ta.check_all(config={
     #     'max-line-length': 120,
     #     'max-nested-blocks': 4,
-    #     'extra-imports': ['random', 'a2_adversarial_wordle', 'a2_game_tree'],
+    #     'extra-imports': ['random', 'a2_adversarial_wordle', 'a2_game_tree', 'a2_moves'],
     #     'allowed-io': ['run_learning_algorithm']
     # })
 
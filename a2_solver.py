@@ -0,0 +1,301 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Exact Solver)
+
+Module Description
+==================
+
+This module contains an exact solver for Adversarial Wordle. ExactSolver computes the guesser win
+probability of a game state directly, without building a game tree: the value it returns for a state
+is the guesser win probability of the root of the complete game tree generated from that state to the
+end of the game (see a2_part2.generate_complete_game_tree and GameTree._update_guesser_win_probability).
+That is, the Guesser chooses among the possible answers, and on the Adversary's turn every distinct
+status (other than "all correct", unless the guess is the only possible answer) is
+
+    - equally likely, so the state's value is the AVERAGE of the values of the statuses, or
+    - in *minimizing* mode, chosen by a truly adversarial Adversary, so the state's value is the
+      MINIMUM of the values of the statuses.
+
+The solver only ever looks at the possible answers and the number of guesses remaining, so equivalent
+states reached by different move sequences are solved once: the value of each Guesser state is
+memoized under the (sorted) ids of its possible answers and its number of remaining guesses. Statuses
+are looked up in the word set's feedback matrix (see a2_feedback), and the possible answers are
+partitioned by status once per guess. A Guesser state stops looking at guesses as soon as one of them
+reaches a value of 1.0, and an Adversary state stops looking at statuses as soon as it cannot beat the
+best guess found so far (so its value is only computed exactly when it matters).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Isaac Waller.
+"""
+from __future__ import annotations
+import collections
+import operator
+from typing import Optional
+
+import a2_adversarial_wordle as aw
+import a2_feedback
+import a2_word_sets
+
+
+class ExactSolver:
+    """A solver that computes the exact guesser win probabilities of Adversarial Wordle game states.
+
+    Words are identified by their ids in the solver's feedback matrix.
+
+    Instance Attributes:
+        - feedback: the feedback matrix used to look up statuses
+        - minimizing: whether the Adversary returns the status that is worst for the Guesser (True),
+          or every status is equally likely (False)
+        - hits: the number of Guesser states whose value was found in the memo
+        - misses: the number of Guesser states whose value had to be computed
+
+    Representation Invariants:
+        - all(0.0 <= value <= 1.0 for value in self._values.values())
+    """
+    feedback: a2_feedback.FeedbackMatrix
+    minimizing: bool
+    hits: int
+    misses: int
+
+    # Private Instance Attributes:
+    #   - _values: the values of the Guesser states solved so far, keyed by the sorted ids of their
+    #              possible answers and their number of remaining guesses
+    #   - _all_correct: the pattern code of the "all correct" status
+    _values: dict[tuple[tuple[int, ...], int], float]
+    _all_correct: int
+
+    def __init__(self, feedback: a2_feedback.FeedbackMatrix, minimizing: bool = False) -> None:
+        """Initialize a new solver that uses the given feedback matrix."""
+        self.feedback = feedback
+        self.minimizing = minimizing
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+        self._all_correct = a2_feedback.all_correct_code(feedback.word_size)
+
+    def evaluate(self, game: aw.AdversarialWordle) -> float:
+        """Return the guesser win probability of the current state of game.
+
+        >>> game = aw.AdversarialWordle({'hello', 'words', 'world'}, 3)
+        >>> solver = ExactSolver(a2_feedback.compute_feedback_matrix(game.word_set))
+        >>> solver.evaluate(game)
+        1.0
+        >>> game = aw.AdversarialWordle({'aaa', 'aab', 'aac', 'bbb'}, 2)
+        >>> feedback = a2_feedback.compute_feedback_matrix(game.word_set)
+        >>> ExactSolver(feedback).evaluate(game)
+        0.5
+        >>> ExactSolver(feedback, minimizing=True).evaluate(game)
+        0.0
+
+        Preconditions:
+            - all(word in self.feedback for word in game.word_set)
+        """
+        state = game.state
+        if state.winner is not None:
+            return 1.0 if state.winner == 'Guesser' else 0.0
+
+        answer_ids = tuple(sorted(self.feedback.word_id(word) for word in state.possible_answers))
+        if state.guesser_turn:
+            return self.guesser_value(answer_ids, state.guesses_remaining)
+        else:
+            return self.adversary_value(answer_ids, self.feedback.word_id(state.move), state.guesses_remaining)
+
+    def best_guess(self, game: aw.AdversarialWordle) -> str:
+        """Return a guess with the highest guesser win probability in the current state of game.
+
+        Preconditions:
+            - game.is_guesser_turn() and game.get_winner() is None
+            - all(word in self.feedback for word in game.word_set)
+        """
+        state = game.state
+        answer_ids = tuple(sorted(self.feedback.word_id(word) for word in state.possible_answers))
+
+        def guess_value(guess_id: int) -> float:
+            """Return the guesser win probability after guessing the word with the given id."""
+            return self.adversary_value(answer_ids, guess_id, state.guesses_remaining - 1)
+
+        best_id = max(answer_ids, key=guess_value)
+        return self.feedback.words[best_id]
+
+    def guesser_value(self, answer_ids: tuple[int, ...], guesses_remaining: int) -> float:
+        """Return the guesser win probability of the Guesser's turn when the possible answers are the words
+        with the given ids and the Guesser has guesses_remaining guesses left.
+
+        Preconditions:
+            - answer_ids is non-empty and sorted
+            - guesses_remaining >= 0
+        """
+        if len(answer_ids) == 1:
+            return 1.0
+        elif guesses_remaining <= 1:
+            # The last guess can only be correct if there is one possible answer
+            return 0.0
+
+        key = (answer_ids, guesses_remaining)
+        value = self._values.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        getter = operator.itemgetter(*answer_ids)
+        if guesses_remaining == 2:
+            value = self._last_round_value(getter, answer_ids)
+        else:
+            # Try the guesses that split the possible answers into the most statuses first, since they are
+            # the most likely to be the best ones
+            num_statuses = [len(set(getter(self.feedback.row(guess_id)))) for guess_id in answer_ids]
+            order = sorted(range(len(answer_ids)), key=num_statuses.__getitem__, reverse=True)
+
+            value = 0.0
+            for i in order:
+                buckets = self._partition(getter, answer_ids, answer_ids[i])
+                value = max(value, self._buckets_value(buckets, guesses_remaining - 1, value))
+                if value == 1.0:
+                    break
+
+        self._values[key] = value
+        return value
+
+    def adversary_value(self, answer_ids: tuple[int, ...], guess_id: int, guesses_remaining: int) -> float:
+        """Return the guesser win probability of the Adversary's turn when the possible answers are the words
+        with the given ids, the Guesser has just guessed the word with id guess_id, and the Guesser has
+        guesses_remaining guesses left after it.
+
+        Preconditions:
+            - answer_ids is non-empty and sorted
+            - guess_id in answer_ids
+            - guesses_remaining >= 0
+        """
+        if len(answer_ids) == 1:
+            return 1.0
+        buckets = self._partition(operator.itemgetter(*answer_ids), answer_ids, guess_id)
+        return self._buckets_value(buckets, guesses_remaining, -1.0)
+
+    def get_stats(self) -> dict[str, int]:
+        """Return the hit, miss and size statistics of this solver's memo."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._values)}
+
+    def _partition(self, getter: operator.itemgetter, answer_ids: tuple[int, ...],
+                   guess_id: int) -> list[tuple[int, ...]]:
+        """Return the ids in answer_ids grouped by their status for the guess with id guess_id, leaving out
+        the "all correct" status (that is, the guess itself).
+
+        getter is operator.itemgetter(*answer_ids).
+
+        Preconditions:
+            - len(answer_ids) > 1
+            - guess_id in answer_ids
+        """
+        ids_by_pattern = {}
+        for pattern, answer_id in zip(getter(self.feedback.row(guess_id)), answer_ids):
+            ids_by_pattern.setdefault(pattern, []).append(answer_id)
+        del ids_by_pattern[self._all_correct]
+        return [tuple(ids) for ids in ids_by_pattern.values()]
+
+    def _last_round_value(self, getter: operator.itemgetter, answer_ids: tuple[int, ...]) -> float:
+        """Return the value of the Guesser's turn when the possible answers are the words with the given ids
+        and the Guesser has two guesses left.
+
+        After the first guess, the Guesser wins exactly when the status leaves one possible answer, so
+        the statuses only need to be counted, not partitioned.
+
+        getter is operator.itemgetter(*answer_ids).
+
+        Preconditions:
+            - len(answer_ids) > 1
+        """
+        value = 0.0
+        for guess_id in answer_ids:
+            counts = collections.Counter(getter(self.feedback.row(guess_id)))
+            # Leave out the "all correct" status, which only the guess itself has
+            num_statuses = len(counts) - 1
+            num_won = list(counts.values()).count(1) - 1
+            if self.minimizing:
+                guess_value = 1.0 if num_won == num_statuses else 0.0
+            else:
+                guess_value = num_won / num_statuses
+            if guess_value > value:
+                value = guess_value
+                if value == 1.0:
+                    break
+        return value
+
+    def _buckets_value(self, buckets: list[tuple[int, ...]], guesses_remaining: int, bound: float) -> float:
+        """Return the value of the Adversary's turn whose statuses lead to the given possible answers
+        (buckets), when the Guesser has guesses_remaining guesses left.
+
+        If the value is at most bound, any value between it and bound may be returned instead.
+
+        Preconditions:
+            - buckets is non-empty, and no bucket is empty
+            - guesses_remaining >= 0
+        """
+        if self.minimizing:
+            # The largest buckets are the most likely to be the worst for the Guesser
+            value = 1.0
+            for bucket in sorted(buckets, key=len, reverse=True):
+                value = min(value, self._status_value(bucket, guesses_remaining))
+                if value <= bound:
+                    break
+            return value
+
+        # A bucket with one answer is won by the Guesser in the next guess (if there is one)
+        n = len(buckets)
+        total = 0.0
+        unknown = n
+        for bucket in buckets:
+            if len(bucket) == 1:
+                total += self._status_value(bucket, guesses_remaining)
+                unknown -= 1
+        for bucket in buckets:
+            if len(bucket) > 1:
+                if (total + unknown) / n <= bound:
+                    return (total + unknown) / n
+                total += self._status_value(bucket, guesses_remaining)
+                unknown -= 1
+        return total / n
+
+    def _status_value(self, bucket: tuple[int, ...], guesses_remaining: int) -> float:
+        """Return the value of the Guesser's turn after a status that leaves the possible answers in bucket,
+        when the Guesser has guesses_remaining guesses left (so the Adversary wins if it is 0).
+        """
+        return 0.0 if guesses_remaining == 0 else self.guesser_value(bucket, guesses_remaining)
+
+
+def solve_word_set(word_set_file: str, max_guesses: int, minimizing: bool = False,
+                   solver: Optional[ExactSolver] = None) -> float:
+    """Return the guesser win probability at the start of a game with the given word set file and
+    maximum number of guesses (see ExactSolver).
+
+    If solver is not None, it is used (and its memo is kept) instead of a new solver.
+
+    >>> solve_word_set('data/words/official_wordle_100.txt', 2)
+    0.6
+    >>> solve_word_set('data/words/official_wordle_100.txt', 3, minimizing=True)
+    0.0
+
+    Preconditions:
+        - same preconditions for word_set_file and max_guesses as a2_adversarial_wordle.run_game
+        - solver is None or solver.feedback is the word set's feedback matrix
+    """
+    word_set = a2_word_sets.load_word_set(word_set_file)
+    if solver is None:
+        solver = ExactSolver(word_set.feedback, minimizing)
+    return solver.evaluate(aw.AdversarialWordle(word_set, max_guesses, word_set.feedback))
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod(verbose=True)
+
+    # import time
+    # start = time.perf_counter()
+    # print(solve_word_set('data/words/official_wordle_1000.txt', 4), time.perf_counter() - start)
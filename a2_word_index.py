@@ -0,0 +1,249 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Word Indexes)
+
+Module Description
+==================
+
+This module contains an inverted index over the words of an Adversarial Wordle word set.
+For each position i and letter c, the index stores a *bitset* (a Python int) whose bit k is set
+exactly when the word with id k has the letter c at position i. A set of candidate answers is then
+just another bitset, and filtering it by a (guess, status) pair takes a handful of bitwise AND/AND NOT
+operations instead of checking every word.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Angela Zavaleta Bernuy.
+"""
+from __future__ import annotations
+import collections
+from typing import Iterable, Iterator, Sequence
+
+import a2_feedback
+
+# _BYTE_BITS[b] is the tuple of positions of the bits that are set in the byte b
+_BYTE_BITS = tuple(tuple(bit for bit in range(0, 8) if b >> bit & 1) for b in range(0, 256))
+
+# The maximum number of word indexes kept by get_word_index
+INDEX_CACHE_SIZE = 8
+
+# The most recently used word indexes built by get_word_index, keyed by their word collection, from the
+# least to the most recently used
+_built_indexes: collections.OrderedDict[frozenset[str] | tuple[str, ...], WordIndex] = collections.OrderedDict()
+
+
+class WordIndex:
+    """An inverted index of letter positions for the words in a word set.
+
+    Each word is identified by its *id*, which is its index in self.words.
+
+    Instance Attributes:
+        - words: the words in the word set, in sorted order
+        - word_size: the length of the words in the word set
+        - all_mask: the bitset containing every word in the word set
+
+    Representation Invariants:
+        - len(self.words) > 0
+        - list(self.words) == sorted(set(self.words))
+        - all(len(word) == self.word_size for word in self.words)
+        - self.all_mask == 2 ** len(self.words) - 1
+    """
+    words: tuple[str, ...]
+    word_size: int
+    all_mask: int
+
+    # Private Instance Attributes:
+    #   - _ids: a mapping from each word to its id
+    #   - _position_masks: _position_masks[i][c] is the bitset of the words that have the letter c
+    #                      at position i. Letters that no word has at position i are not stored.
+    _ids: dict[str, int]
+    _position_masks: list[dict[str, int]]
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """Initialize a new index for the given words.
+
+        Preconditions:
+            - words is non-empty
+            - all words have the same length
+        """
+        self.words = tuple(sorted(set(words)))
+        self.word_size = len(self.words[0])
+        self.all_mask = (1 << len(self.words)) - 1
+        self._ids = {word: i for i, word in enumerate(self.words)}
+
+        self._position_masks = []
+        for i in range(0, self.word_size):
+            ids_by_letter = {}
+            for word_id, word in enumerate(self.words):
+                ids_by_letter.setdefault(word[i], []).append(word_id)
+            self._position_masks.append({letter: self.mask_of_ids(ids) for letter, ids in ids_by_letter.items()})
+
+    def __len__(self) -> int:
+        """Return the number of words in this index."""
+        return len(self.words)
+
+    def word_id(self, word: str) -> int:
+        """Return the id of the given word, or -1 if it is not in this index."""
+        return self._ids.get(word, -1)
+
+    def mask_of_ids(self, ids: Iterable[int]) -> int:
+        """Return the bitset containing exactly the words with the given ids.
+
+        Preconditions:
+            - all(0 <= word_id < len(self) for word_id in ids)
+        """
+        bitmap = bytearray((len(self.words) + 7) // 8)
+        for word_id in ids:
+            bitmap[word_id >> 3] |= 1 << (word_id & 7)
+        return int.from_bytes(bitmap, 'little')
+
+    def ids_of_mask(self, mask: int) -> list[int]:
+        """Return the ids of the words in the given bitset, in increasing order.
+
+        >>> index = WordIndex(['bb', 'aa', 'cc'])
+        >>> index.ids_of_mask(0b101)
+        [0, 2]
+        """
+        ids = []
+        for byte_index, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, 'little')):
+            if byte:
+                base = byte_index * 8
+                ids.extend(base + bit for bit in _BYTE_BITS[byte])
+        return ids
+
+    def candidates(self, words: Iterable[str]) -> CandidateSet:
+        """Return the candidate set containing the given words.
+
+        Preconditions:
+            - all(self.word_id(word) != -1 for word in words)
+        """
+        if isinstance(words, (set, frozenset)) and len(words) == len(self.words):
+            return CandidateSet(self, self.all_mask)
+        return CandidateSet(self, self.mask_of_ids(self._ids[word] for word in words))
+
+    def filter_mask(self, mask: int, guess: str, digits: Sequence[int]) -> int:
+        """Return the words in the bitset mask whose status for guess has the given digits.
+
+        digits[i] is the digit (see a2_feedback) of the character status of guess[i]. A character
+        that is not CORRECT is WRONG_POSITION exactly when the answer has the same letter at some
+        position whose character status is not CORRECT, so once the CORRECT positions are fixed,
+        every other constraint is a union of position masks.
+
+        Preconditions:
+            - len(guess) == len(digits) == self.word_size
+            - all(digit in {0, 1, 2} for digit in digits)
+
+        >>> index = WordIndex(['hello', 'words', 'world'])
+        >>> index.ids_of_mask(index.filter_mask(index.all_mask, 'words', [2, 2, 2, 1, 0]))
+        [2]
+        """
+        mismatched = []
+        for i in range(0, self.word_size):
+            position_mask = self._position_masks[i].get(guess[i], 0)
+            if digits[i] == a2_feedback.CORRECT_DIGIT:
+                mask &= position_mask
+            else:
+                mask &= ~position_mask
+                mismatched.append(i)
+
+        for i in mismatched:
+            letter_mask = 0
+            for j in mismatched:
+                letter_mask |= self._position_masks[j].get(guess[i], 0)
+            if digits[i] == a2_feedback.WRONG_POSITION_DIGIT:
+                mask &= letter_mask
+            else:
+                mask &= ~letter_mask
+
+        return mask
+
+
+class CandidateSet:
+    """An immutable set of words from a WordIndex, stored as a bitset of word ids.
+
+    Instance Attributes:
+        - index: the index that the words belong to
+        - mask: the bitset of the ids of the words in this set
+
+    Representation Invariants:
+        - 0 <= self.mask <= self.index.all_mask
+    """
+    __slots__ = ('index', 'mask')
+    index: WordIndex
+    mask: int
+
+    def __init__(self, index: WordIndex, mask: int) -> None:
+        """Initialize a new candidate set of the words in index whose ids are in mask."""
+        self.index = index
+        self.mask = mask
+
+    def __len__(self) -> int:
+        """Return the number of words in this set."""
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        """Return whether this set is non-empty."""
+        return self.mask != 0
+
+    def __contains__(self, word: object) -> bool:
+        """Return whether the given word is in this set."""
+        word_id = self.index.word_id(word) if isinstance(word, str) else -1
+        return word_id != -1 and self.mask >> word_id & 1 == 1
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the words in this set, in sorted order."""
+        words = self.index.words
+        if self.mask == self.index.all_mask:
+            return iter(words)
+        return (words[word_id] for word_id in self.index.ids_of_mask(self.mask))
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a candidate set from the same index with the same words."""
+        return isinstance(other, CandidateSet) and self.index is other.index and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        """Return the hash of this set."""
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        """Return a string representation of this set."""
+        return f'CandidateSet({sorted(self)!r})'
+
+    def filter(self, guess: str, digits: Sequence[int]) -> CandidateSet:
+        """Return the words in this set whose status for guess has the given digits.
+
+        See WordIndex.filter_mask for the preconditions.
+        """
+        return CandidateSet(self.index, self.index.filter_mask(self.mask, guess, digits))
+
+
+def get_word_index(words: frozenset[str] | tuple[str, ...]) -> WordIndex:
+    """Return the index for the given words, building it only if it is not one of the INDEX_CACHE_SIZE
+    most recently used indexes.
+
+    Word sets loaded with a2_word_sets.load_word_set keep their own index (WordSet.index), so this cache
+    only holds indexes for other collections of words.
+
+    >>> _built_indexes.clear()
+    >>> index = get_word_index(('aaa', 'bbb'))
+    >>> get_word_index(('aaa', 'bbb')) is index
+    True
+    >>> for i in range(0, INDEX_CACHE_SIZE):
+    ...     _ = get_word_index((f'{i:03}',))
+    >>> len(_built_indexes) == INDEX_CACHE_SIZE and ('aaa', 'bbb') not in _built_indexes
+    True
+    """
+    index = _built_indexes.get(words)
+    if index is None:
+        index = WordIndex(words)
+        _built_indexes[words] = index
+        if len(_built_indexes) > INDEX_CACHE_SIZE:
+            _built_indexes.popitem(last=False)
+    else:
+        _built_indexes.move_to_end(words)
+    return index
@@ -0,0 +1,132 @@
+"""CSC111 Winter 2023 Assignment 2: Trees, Wordle, and Artificial Intelligence (Word Sets)
+
+Module Description
+==================
+
+This module contains a process-wide registry of Adversarial Wordle word sets. Each word file is
+read only once per process; every later request for the same file returns the same immutable
+WordSet object, together with the word index and feedback matrix attached to it.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2023 Mario Badr, David Liu, and Angela Zavaleta Bernuy.
+"""
+from __future__ import annotations
+import os
+import sys
+from typing import Iterable, Optional
+
+import a2_feedback
+import a2_word_index
+
+# The word sets that have been loaded in this process, keyed by the absolute path of their word file
+_registry: dict[str, WordSet] = {}
+
+
+class WordSet(frozenset):
+    """An immutable set of words loaded from a word file.
+
+    Because WordSet is a subclass of frozenset, a WordSet can be used anywhere a word set is expected.
+    Each word is identified by its *id*, which is its index in self.words.
+
+    Instance Attributes:
+        - words: the words in this set, in sorted order
+        - word_size: the length of the words in this set
+        - source: the absolute path of the word file this set was loaded from, or None if it was not loaded
+          from a file
+
+    Representation Invariants:
+        - len(self) > 0
+        - list(self.words) == sorted(self)
+        - all(len(word) == self.word_size for word in self)
+    """
+    words: tuple[str, ...]
+    word_size: int
+    source: Optional[str]
+
+    # Private Instance Attributes:
+    #   - _index: the word index for this set, or None if it has not been built yet
+    #   - _feedback: the feedback matrix for this set, or None if it has not been loaded yet
+    _index: Optional[a2_word_index.WordIndex]
+    _feedback: Optional[a2_feedback.FeedbackMatrix]
+
+    def __new__(cls, words: Iterable[str], source: Optional[str] = None) -> WordSet:
+        """Create a new word set containing the given words.
+
+        Raises ValueError if there are no words, or if the words do not all have the same length.
+        """
+        word_set = super().__new__(cls, (sys.intern(word) for word in words))
+        if len(word_set) == 0:
+            raise ValueError(f'{source or "word set"} contains no words')
+
+        word_set.words = tuple(sorted(word_set))
+        word_set.word_size = len(word_set.words[0])
+        if any(len(word) != word_set.word_size for word in word_set.words):
+            raise ValueError(f'{source or "word set"} contains words of different lengths')
+
+        word_set.source = source
+        word_set._index = None
+        word_set._feedback = None
+        return word_set
+
+    def __reduce__(self) -> tuple:
+        """Return the information needed to pickle this word set."""
+        return (WordSet, (self.words, self.source))
+
+    @property
+    def index(self) -> a2_word_index.WordIndex:
+        """The word index for this set, which is built the first time it is requested.
+
+        The ids of the index are the same as the ids of this set.
+        """
+        if self._index is None:
+            self._index = a2_word_index.WordIndex(self.words)
+        return self._index
+
+    @property
+    def feedback(self) -> a2_feedback.FeedbackMatrix:
+        """The feedback matrix for this set, which is loaded (or computed) the first time it is requested.
+
+        The ids of the feedback matrix are the same as the ids of this set.
+        """
+        if self._feedback is None:
+            if self.source is None:
+                self._feedback = a2_feedback.compute_feedback_matrix(self.words)
+            else:
+                self._feedback = a2_feedback.load_feedback_matrix(self.source)
+                if self._feedback.words != self.words:
+                    raise ValueError(f'the saved feedback matrix for {self.source} does not match its words')
+        return self._feedback
+
+
+def load_word_set(word_set_file: str) -> WordSet:
+    """Return the word set for the given word file, reading the file only the first time it is requested.
+
+    Each line of the file is lowercased and stripped of surrounding whitespace; blank lines are ignored.
+
+    Raises ValueError if the file contains no words, or words of different lengths.
+
+    The source of the word set is the absolute path of the file, so that its feedback matrix can still be
+    loaded (including in worker processes) after the working directory changes.
+
+    >>> word_set = load_word_set('data/words/official_wordle_5.txt')
+    >>> word_set.source == os.path.abspath('data/words/official_wordle_5.txt')
+    True
+
+    Preconditions:
+        - word_set_file is a file with one word per line
+    """
+    path = os.path.abspath(word_set_file)
+    if path not in _registry:
+        with open(path) as f:
+            words = {line.strip().lower() for line in f}
+        words.discard('')
+        _registry[path] = WordSet(words, path)
+    return _registry[path]